@@ -0,0 +1,299 @@
+"""Shared HTTP client for the FastAPI backend.
+
+Every call from the UI goes through one pooled ``requests.Session`` per server
+process, so Streamlit reruns reuse keep-alive connections instead of opening a
+new TCP connection on each click.
+
+Tabular endpoints can optionally answer in Arrow IPC stream format
+(``API_ARROW=1``). The backend sends the table rows as the record batches and
+puts the name of the tabular field (``top_institutions``, ``institutions`` or
+``comparison``) in the schema metadata under ``table``, with the remaining
+scalar fields JSON-encoded under ``fields``. The client decodes that back into
+the same dict shape as the JSON path, with a DataFrame in place of the rows.
+"""
+import json
+import logging
+import os
+
+import orjson
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+
+import perf
+from response_cache import get_response_cache, normalize_payload
+from singleflight import get_single_flight
+from snapshot import SNAPSHOT_MAX_AGE, get_snapshot_store
+
+API_BASE = os.environ.get("API_BASE", "http://127.0.0.1:8000")
+
+# Connection pool size should cover the Streamlit worker threads of one process
+POOL_SIZE = int(os.environ.get("API_POOL_SIZE", "20"))
+MAX_RETRIES = int(os.environ.get("API_MAX_RETRIES", "2"))
+BACKOFF_FACTOR = float(os.environ.get("API_BACKOFF_FACTOR", "0.3"))
+
+# (connect, read) timeouts in seconds per backend path
+TIMEOUTS = {
+    "/": (1.0, 2.0),
+    "/analyze": (3.05, 30.0),
+    "/insights": (3.05, 90.0),  # Gemini + retrieval can take a while
+    "/insights/stream": (3.05, 90.0),  # read timeout applies between events
+    "/support-services": (3.05, 30.0),
+    "/catalog": (3.05, 30.0),
+    "/roi": (3.05, 30.0),
+    "/compare": (3.05, 45.0),
+}
+DEFAULT_TIMEOUT = (3.05, 30.0)
+
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_ENABLED = os.environ.get("API_ARROW", "").lower() in ("1", "true", "yes")
+# Paths whose responses carry a table worth shipping as Arrow
+ARROW_PATHS = {"/analyze", "/support-services", "/compare"}
+
+# Cacheable query endpoints: name -> (method, path)
+ENDPOINTS = {
+    "analyze": ("POST", "/analyze"),
+    "insights": ("GET", "/insights"),
+    "support-services": ("GET", "/support-services"),
+    "roi": ("POST", "/roi"),
+    "compare": ("POST", "/compare"),
+}
+
+logger = logging.getLogger(__name__)
+
+# Stream paths this process's backend answered without an event stream (e.g. 404)
+_unstreamable = set()
+
+
+@st.cache_resource
+def get_session():
+    """Return the process-wide session with a tuned pool and bounded retries."""
+    retry = Retry(
+        total=MAX_RETRIES,
+        connect=MAX_RETRIES,
+        # Never replay a request whose response was already being read:
+        # a slow /insights call would otherwise multiply its latency.
+        # False (not 0) lets a read timeout surface as requests.ReadTimeout.
+        read=False,
+        status=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=(502, 503, 504),
+        # All backend endpoints are read-only queries, so POST is safe to retry
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "Accept": "application/json",
+        "Accept-Encoding": "gzip, deflate",
+    })
+    return session
+
+
+def request(method, path, session=None, **kwargs):
+    """Send a request to ``API_BASE + path`` through the shared session.
+
+    Background threads pass the ``session`` they resolved on the script
+    thread, since ``get_session`` is a Streamlit cached resource.
+    """
+    kwargs.setdefault("timeout", TIMEOUTS.get(path, DEFAULT_TIMEOUT))
+    if ARROW_ENABLED and path in ARROW_PATHS and "headers" not in kwargs:
+        kwargs["headers"] = {"Accept": f"{ARROW_CONTENT_TYPE}, application/json;q=0.9"}
+    return (session or get_session()).request(method, f"{API_BASE}{path}", **kwargs)
+
+
+def get_json(path, params=None, failures=None):
+    """GET ``path`` and return the decoded JSON body, or ``None`` on failure."""
+    return _json_or_none("GET", path, failures, params=params)
+
+
+def post_json(path, payload, failures=None):
+    """POST ``payload`` to ``path`` and return the decoded JSON body, or ``None`` on failure."""
+    return _json_or_none("POST", path, failures, json=payload)
+
+
+def query(endpoint, payload=None, failures=None, cancelled=None):
+    """Run a named backend query, serving repeated payloads from the response cache.
+
+    GET endpoints send ``payload`` as query parameters, POST endpoints as the
+    JSON body. Concurrent identical queries from other sessions are coalesced
+    into one backend call. Fresh snapshot rows are served without calling the
+    backend, and stale ones only when the backend fails; both carry a
+    ``_snapshot_at`` timestamp. Returns the decoded JSON, or ``None`` if the
+    backend call fails with nothing to fall back on; failures are never cached.
+
+    Pass a list as ``failures`` to learn why a backend call failed: it gets
+    ``"connection"``, ``"timeout"`` or the HTTP status code appended. A
+    ``cancelled`` event (from a background request) stops waiting on another
+    session's identical call once it is set.
+    """
+    method, path = ENDPOINTS[endpoint]
+    cache = get_response_cache()
+    data = cache.get(endpoint, payload)
+    perf.event("cache", endpoint, hit=data is not None)
+    if data is not None:
+        return data
+
+    snapshot = get_snapshot_store()
+    snapshot_data = snapshot.lookup(endpoint, payload)
+    perf.event("snapshot", endpoint, hit=snapshot_data is not None)
+    if snapshot_data is not None and snapshot.age <= SNAPSHOT_MAX_AGE:
+        return snapshot_data
+
+    def fetch():
+        # A flight that just finished may already have filled the cache
+        data = cache.peek(endpoint, payload)
+        if data is not None:
+            return data
+        if method == "GET":
+            data = get_json(path, params=payload, failures=failures)
+        else:
+            data = post_json(path, payload, failures=failures)
+        if data is not None:
+            cache.put(endpoint, payload, data)
+        return data
+
+    # Identical queries already in flight from other sessions share that call
+    data = get_single_flight().do((endpoint, normalize_payload(payload)), fetch, label=endpoint,
+                                  cancelled=cancelled)
+    return data if data is not None else snapshot_data
+
+
+def stream_events(path, params=None):
+    """Open a server-sent events stream on ``path``.
+
+    Returns an iterator of ``(event, data)`` tuples, where ``data`` is the
+    decoded JSON payload (or the raw string if it is not JSON). Returns
+    ``None`` when the backend is unreachable or answers without
+    ``text/event-stream``, so callers can fall back to the blocking endpoint.
+    A backend that answers without a stream is remembered for the life of the
+    process; check ``can_stream`` before calling again.
+    """
+    # Times the wait for response headers, i.e. the time to the first event
+    with perf.span("request", path, method="GET") as span:
+        try:
+            resp = request("GET", path, params=params, stream=True,
+                           headers={"Accept": "text/event-stream"})
+        except requests.RequestException as exc:
+            span["error"] = type(exc).__name__
+            logger.warning("GET %s failed: %s", path, exc)
+            return None
+        span["status"] = resp.status_code
+    if not resp.ok or not resp.headers.get("Content-Type", "").startswith("text/event-stream"):
+        resp.close()
+        # A 5xx may be transient; anything else means this backend has no such stream
+        if resp.status_code < 500:
+            _unstreamable.add(path)
+        return None
+    resp.encoding = "utf-8"
+    return _iter_sse(resp)
+
+
+def can_stream(path):
+    """False once the backend has shown it doesn't serve ``path`` as an event stream."""
+    return path not in _unstreamable
+
+
+def _iter_sse(resp):
+    event, data = "message", []
+    with resp:
+        try:
+            # chunk_size=None hands over each chunk as soon as it arrives
+            for line in resp.iter_lines(chunk_size=None, decode_unicode=True):
+                if not line:
+                    if data:
+                        yield event, _decode_event_data("\n".join(data))
+                    event, data = "message", []
+                    continue
+                if line.startswith(":"):
+                    continue
+                field, _, value = line.partition(":")
+                value = value[1:] if value.startswith(" ") else value
+                if field == "event":
+                    event = value
+                elif field == "data":
+                    data.append(value)
+        except requests.RequestException as exc:
+            logger.warning("Event stream %s broke off: %s", resp.url, exc)
+            yield "error", str(exc)
+            return
+        if data:
+            yield event, _decode_event_data("\n".join(data))
+
+
+def _decode_event_data(raw):
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def _json_or_none(method, path, failures=None, **kwargs):
+    with perf.span("request", path, method=method) as span:
+        try:
+            resp = request(method, path, **kwargs)
+            # Reading the body here keeps the download inside the request span
+            span["bytes"] = len(resp.content)
+        except requests.RequestException as exc:
+            span["error"] = type(exc).__name__
+            logger.warning("%s %s failed: %s", method, path, exc)
+            if failures is not None:
+                failures.append(failure_kind(exc))
+            return None
+        span["status"] = resp.status_code
+    if not resp.ok:
+        logger.warning("%s %s returned HTTP %s", method, path, resp.status_code)
+        if failures is not None:
+            failures.append(resp.status_code)
+        return None
+    return decode_body(resp.headers.get("Content-Type", ""), resp.content, path)
+
+
+def failure_kind(exc):
+    """Classify a ``requests`` exception as ``"connection"`` (backend unreachable) or ``"timeout"``."""
+    if isinstance(exc, requests.ConnectTimeout):
+        return "connection"
+    if isinstance(exc, requests.Timeout):
+        return "timeout"
+    # urllib3 can still wrap a read timeout in MaxRetryError -> ConnectionError
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    if isinstance(reason, ReadTimeoutError):
+        return "timeout"
+    return "connection"
+
+
+def decode_body(content_type, content, path=""):
+    """Decode a JSON or Arrow IPC response body into the endpoint's dict shape."""
+    is_arrow = content_type.startswith(ARROW_CONTENT_TYPE)
+    with perf.span("decode", path, format="arrow" if is_arrow else "json"):
+        if is_arrow:
+            return _decode_arrow(content)
+        return orjson.loads(content)
+
+
+def _decode_arrow(content):
+    import pyarrow as pa
+
+    # Reading from a py_buffer keeps the columns pointing at the response bytes
+    table = pa.ipc.open_stream(pa.py_buffer(content)).read_all()
+    metadata = table.schema.metadata or {}
+    data = orjson.loads(metadata.get(b"fields", b"{}"))
+    frame = table.replace_schema_metadata(None).to_pandas(split_blocks=True, self_destruct=True)
+    data[metadata.get(b"table", b"rows").decode()] = frame
+    return data
+
+
+def as_frame(rows):
+    """Return tabular response data as a DataFrame, whichever transport delivered it."""
+    import pandas as pd
+
+    if isinstance(rows, pd.DataFrame):
+        return rows
+    with perf.span("frame", "table", rows=len(rows or [])):
+        return pd.DataFrame(rows or [])
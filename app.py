@@ -1,10 +1,19 @@
-import os
-import requests
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
-API_BASE = os.environ.get("API_BASE", "http://127.0.0.1:8000")
+import api_client
+import perf
+from catalog import canonical_input
+from charts import TOP_N_CHART, bar_chart, heatmap, line_chart, show_chart, top_n_with_other
+from comparison import METRICS, compare_institutions, metric_leaders, parse_institutions, rank_institutions
+from executor import get_executor
+from health import get_health_monitor
+from prefetch import warm_session
+from response_cache import get_response_cache, normalize_payload
+from roi_engine import RoiInputs, break_even_sweep, break_even_years, roi_curves, roi_summary
+from services import ServicesFeed, first_page_payload, page, page_count, services_summary
+from session_store import format_bytes, get_session_store, process_report, session_report
+from singleflight import get_single_flight
+from snapshot import freshness_badge, get_snapshot_store
 
 st.set_page_config(
     page_title="Career Outcomes Agent", 
@@ -13,6 +22,9 @@ st.set_page_config(
     page_icon="🎓"
 )
 
+perf.start_metrics_server()
+perf.begin_run()
+
 # Custom CSS for better styling
 st.markdown("""
 <style>
@@ -109,21 +121,24 @@ with st.sidebar:
     1. **Dashboard:** Enter degree and year
     2. **Insights:** Ask questions about careers
     3. **Support:** View institution services
-    4. **Compare:** Analyze two institutions
+    4. **Compare:** Analyze two or more institutions
     """)
     
     st.markdown("---")
     st.markdown("### 🔧 Gemini Configuration")
     
-    # Check Gemini status
-    try:
-        resp = requests.get(f"{API_BASE}/", timeout=2)
-        if resp.ok:
-            st.success("✅ Backend connected")
-        else:
-            st.error("❌ Backend not responding")
-    except:
+    # Backend status comes from the background monitor; never block the rerun on it
+    health = get_health_monitor().status()
+    if health.state == "up":
+        st.success("✅ Backend connected")
+    elif health.state == "degraded":
+        st.error("❌ Backend not responding")
+    elif health.state == "down":
         st.error("❌ Backend not running")
+    else:
+        st.info("⏳ Checking backend status...")
+    if health.age is not None:
+        st.caption(f"Checked {health.age:.0f}s ago · {health.latency_ms:.0f} ms")
     
     st.markdown("**AI Status:**")
     st.info("🤖 Google Gemini 2.5 Flash integration enabled with offline fallback")
@@ -132,6 +147,35 @@ with st.sidebar:
     st.markdown("### 📊 Data Quality")
     st.info("Data is processed using Gemini-powered analysis with statistical fallback for reliability.")
 
+    with st.expander("🗄️ Response Cache"):
+        flight_stats = get_single_flight().stats()
+        for endpoint, stats in get_response_cache().stats().items():
+            lookups = stats["hits"] + stats["misses"]
+            hit_rate = f"{stats['hits'] / lookups:.0%}" if lookups else "–"
+            coalesced = flight_stats.get(endpoint, {}).get("coalesced", 0)
+            st.caption(
+                f"**/{endpoint}** · {stats['hits']} hits / {stats['misses']} misses "
+                f"({hit_rate}) · {stats['entries']}/{stats['max_entries']} entries · "
+                f"{coalesced} coalesced"
+            )
+        st.caption(f"{get_single_flight().in_flight()} backend calls in flight")
+        snapshot = get_snapshot_store()
+        if len(snapshot):
+            st.caption(f"📦 Snapshot: {len(snapshot)} responses, taken {snapshot.age / 60:.0f} min ago")
+        else:
+            st.caption("📦 No offline snapshot loaded")
+    
+    st.markdown("---")
+    show_perf = st.toggle("📈 Performance", key="show_perf",
+                          help="Timings for every backend call and render step of the last rerun")
+    show_memory = st.toggle("🧠 Memory", key="show_memory",
+                            help="What this session keeps between reruns, and the server process totals")
+    # Filled in at the end of the script, once this rerun's timings and data are known
+    perf_panel = st.container()
+
+# Warm the default views of each tab in the background for this session
+prefetch_job = warm_session()
+
 # Tabs
 tabs = st.tabs([
     "🎓 Career Outcomes Dashboard",
@@ -163,15 +207,16 @@ with tabs[0]:
             )
     
     year_val = int(year) if year else None
+    degree = canonical_input("degree", degree)
     
     if st.button("🔍 Analyze Outcomes", type="primary"):
         with st.spinner("Fetching real-time data..."):
-            resp = requests.post(f"{API_BASE}/analyze", json={"degree": degree, "year": year_val})
-            if resp.ok:
-                data = resp.json()
+            data = api_client.query("analyze", {"degree": degree, "year": year_val})
+            if data is not None:
                 
                 # Display summary with enhanced metrics
                 st.success(data.get("summary"))
+                freshness_badge(data)
                 
                 # Show data quality info
                 if "data_quality" in data:
@@ -183,18 +228,16 @@ with tabs[0]:
                     st.metric("Market Trend", f"{trend_color} {data['trend'].title()}")
                 
                 # Show top institutions
-                top = data.get("top_institutions", [])
-                if top:
-                    df = pd.DataFrame(top)
+                df = api_client.as_frame(data.get("top_institutions"))
+                if not df.empty:
                     st.subheader("🏆 Top Performing Institutions")
                     
                     # Create enhanced chart
-                    fig = px.bar(df, x="institution", y="avg_employment_rate", 
-                               title="Employment Rate by Institution",
-                               color="avg_employment_rate",
-                               color_continuous_scale="Viridis")
-                    fig.update_layout(xaxis_tickangle=-45)
-                    st.plotly_chart(fig, use_container_width=True)
+                    fig = bar_chart(df, x="institution", y="avg_employment_rate", 
+                                    title="Employment Rate by Institution",
+                                    color_scale="Viridis",
+                                    xaxis_tickangle=-45)
+                    show_chart(fig)
                     
                     # Display detailed table
                     st.dataframe(df, use_container_width=True)
@@ -238,38 +281,112 @@ with tabs[1]:
         help="Ask any question about career outcomes, salaries, or institutional comparisons"
     )
     
-    if st.button("🚀 Generate Insights", type="primary") and question:
-        with st.spinner("Analyzing data and generating insights..."):
-            resp = requests.get(f"{API_BASE}/insights", params={"q": question})
-            if resp.ok:
-                data = resp.json()
-                
-                # Display confidence, data freshness, and LLM status
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    if "confidence" in data:
-                        conf_color = "🟢" if data["confidence"] == "High" else "🟡"
-                        st.metric("Confidence", f"{conf_color} {data['confidence']}")
-                with col2:
-                    if "data_freshness" in data:
-                        st.metric("Data Source", f"📊 {data['data_freshness']}")
-                with col3:
-                    if "llm_enabled" in data:
-                        ai_status = "🤖 Gemini" if data["llm_enabled"] else "📊 Statistical"
-                        st.metric("Processing", ai_status)
+    stream_insights = st.toggle(
+        "⚡ Stream the answer as it is generated",
+        value=True,
+        key="stream_insights",
+        help="Falls back to a single response if the backend does not support streaming"
+    )
+    
+    def render_insight_meta(data):
+        # Display confidence, data freshness, and LLM status
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if "confidence" in data:
+                conf_color = "🟢" if data["confidence"] == "High" else "🟡"
+                st.metric("Confidence", f"{conf_color} {data['confidence']}")
+        with col2:
+            if "data_freshness" in data:
+                st.metric("Data Source", f"📊 {data['data_freshness']}")
+        with col3:
+            if "llm_enabled" in data:
+                ai_status = "🤖 Gemini" if data["llm_enabled"] else "📊 Statistical"
+                st.metric("Processing", ai_status)
+    
+    def render_insight_sources(sources):
+        if sources:
+            with st.expander("📚 Data Sources"):
+                for i, s in enumerate(sources, 1):
+                    st.write(f"{i}. {s}")
+    
+    def render_streamed_insights(events):
+        # Metrics and sources are drawn into their slots as soon as their events arrive
+        data = {}
+        meta_area = st.container()
+        st.subheader("💡 AI-Generated Insights")
+        summary_area = st.empty()
+        sources_area = st.container()
+        
+        def tokens():
+            for event, payload in events:
+                if event == "meta":
+                    data.update(payload)
+                    with meta_area:
+                        render_insight_meta(payload)
+                elif event == "token":
+                    yield payload.get("text", "") if isinstance(payload, dict) else str(payload)
+                elif event == "sources":
+                    data["sources"] = payload.get("sources", [])
+                    with sources_area:
+                        render_insight_sources(data["sources"])
+                elif event == "error":
+                    data["error"] = payload
+                    return
+                elif event == "done":
+                    data["done"] = True
+                    return
+        
+        data["summary"] = summary_area.write_stream(tokens())
+        return data
+    
+    insights_payload = {"q": question}
+    flight_key = ("insights", normalize_payload(insights_payload))
+    flight = events = None
+    generate = st.button("🚀 Generate Insights", type="primary") and question
+    # A blocking answer still being fetched for this question survives unrelated reruns
+    pending = get_executor().latest("insights", flight_key)
+    
+    if generate or pending is not None:
+        if (generate and stream_insights and api_client.can_stream("/insights/stream")
+                and get_response_cache().peek("insights", insights_payload) is None):
+            # Lead a flight so the same question from other sessions waits for this stream
+            flight = get_single_flight().lead(flight_key, "insights")
+            if flight is not None:
+                events = api_client.stream_events("/insights/stream", params=insights_payload)
+                if events is None:
+                    get_single_flight().abandon(flight_key, flight)
+        
+        if events is not None:
+            streamed = None
+            try:
+                data = render_streamed_insights(events)
+                if data.pop("done", False):
+                    streamed = data
+                    get_response_cache().put("insights", insights_payload, data)
+            finally:
+                get_single_flight().finish(flight_key, flight, streamed)
+            if streamed is None:
+                st.error("❌ The insight stream was interrupted. Please try again.")
+        else:
+            executor = get_executor()
+            if generate:
+                request = executor.submit("insights", flight_key,
+                                          lambda cancelled: api_client.query("insights", insights_payload,
+                                                                             cancelled=cancelled))
+            else:
+                request = pending
+            data = executor.wait(request, "Analyzing data and generating insights...")
+            if data is not None:
+                render_insight_meta(data)
                 
                 # Display insights
                 st.subheader("💡 AI-Generated Insights")
                 st.write(data.get("summary"))
                 
                 # Show sources
-                sources = data.get("sources", [])
-                if sources:
-                    with st.expander("📚 Data Sources"):
-                        for i, s in enumerate(sources, 1):
-                            st.write(f"{i}. {s}")
-                            
-            else:
+                render_insight_sources(data.get("sources", []))
+                
+            elif not request.cancelled.is_set():
                 st.error("❌ Failed to generate insights. Please check if the backend is running.")
 
 with tabs[2]:
@@ -281,45 +398,86 @@ with tabs[2]:
     with col1:
         st.markdown("### 🏛️ Support Services Index")
         st.markdown("View comprehensive support services offered by different institutions.")
-        if st.button("📊 Load Support Services Data", type="primary"):
+        # The loaded rows live in the bounded session store; if evicted, the feed starts over
+        store = get_session_store()
+        feed = store.get("support_feed") or store.put("support_feed", ServicesFeed())
+        support_search = st.text_input(
+            "🔎 Filter institutions",
+            placeholder="e.g., IIT, University",
+            key="support_search",
+            help="Filters on the server, so only matching institutions are downloaded "
+                 "(filtered here instead if the backend can't)"
+        )
+        
+        load_failed = False
+        if st.button("📊 Load Support Services Data", type="primary") or (
+                feed.loaded and support_search != feed.search):
+            feed.reset(support_search)
             with st.spinner("Loading support services data..."):
-                resp = requests.get(f"{API_BASE}/support-services")
-                if resp.ok:
-                    rows = resp.json().get("institutions", [])
-                    if rows:
-                        df = pd.DataFrame(rows)
-                        
-                        # Display metrics
-                        st.metric("Total Institutions", len(df))
-                        st.metric("Average Support Index", f"{df['support_index'].mean():.1f}")
-                        
-                        # Create enhanced visualization
-                        fig = px.bar(df, x="institution", y="support_index", 
-                                   title="Support Services Index by Institution",
-                                   color="support_index",
-                                   color_continuous_scale="Blues")
-                        fig.update_layout(xaxis_tickangle=-45)
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                        # Display detailed table
-                        st.subheader("📋 Detailed Support Services")
-                        display_df = df[['institution', 'support_index', 'career_services_rating', 
-                                       'alumni_network_strength', 'total_services']].copy()
-                        st.dataframe(display_df, use_container_width=True)
-                        
-                        # Show services breakdown
-                        with st.expander("🔍 View All Services by Institution"):
-                            for _, row in df.iterrows():
-                                st.write(f"**{row['institution']}** ({row['total_services']} services)")
-                                services_list = ", ".join(row['services'][:5])  # Show first 5
-                                if len(row['services']) > 5:
-                                    services_list += f" ... and {len(row['services']) - 5} more"
-                                st.write(services_list)
-                                st.write("---")
-                    else:
-                        st.warning("No support services data available.")
-                else:
-                    st.error("❌ Failed to fetch support services data.")
+                load_failed = not feed.load_more()
+        elif st.session_state.get("support_load_more"):
+            with st.spinner("Loading more institutions..."):
+                load_failed = not feed.load_more()
+        elif not feed.loaded and prefetch_job.get("support-services", first_page_payload()) is not None:
+            # Render straight away once the background prefetch has the first page
+            feed.load_more()
+        if feed.nbytes != feed.stored_nbytes:
+            # Re-measure once after the feed changed; a feed over budget is dropped and starts over
+            feed.stored_nbytes = feed.nbytes
+            store.put("support_feed", feed)
+        
+        if load_failed:
+            st.error("❌ Failed to fetch support services data.")
+        if feed.loaded:
+            df = feed.frame
+            if not df.empty:
+                
+                # Display metrics
+                total_label = f"{len(df)} of {feed.total}" if feed.total else len(df)
+                st.metric("Total Institutions", total_label)
+                st.metric("Average Support Index", f"{df['support_index'].mean():.1f}")
+                freshness_badge({"_snapshot_at": feed.snapshot_at})
+                
+                # Chart the strongest institutions; the long tail is aggregated
+                chart_df = top_n_with_other(df, "institution", "support_index", n=TOP_N_CHART)
+                fig = bar_chart(chart_df, x="institution", y="support_index", 
+                                title="Support Services Index by Institution",
+                                color_scale="Blues",
+                                xaxis_tickangle=-45)
+                show_chart(fig)
+                
+                # Display detailed table
+                st.subheader("📋 Detailed Support Services")
+                display_df = df[['institution', 'support_index', 'career_services_rating', 
+                               'alumni_network_strength', 'total_services']].copy()
+                st.dataframe(display_df, use_container_width=True)
+                
+                # Show services breakdown
+                with st.expander("🔍 View All Services by Institution"):
+                    summary_df = services_summary(df)
+                    pages = page_count(len(summary_df))
+                    page_no = 1
+                    if pages > 1:
+                        page_no = st.number_input(
+                            f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1,
+                            key="services_page"
+                        )
+                    st.dataframe(
+                        page(summary_df, int(page_no)),
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            "institution": st.column_config.TextColumn("Institution"),
+                            "total_services": st.column_config.NumberColumn("Services", format="%d"),
+                            "preview": st.column_config.TextColumn("Highlights", width="large"),
+                            "services": st.column_config.ListColumn("All Services"),
+                        },
+                    )
+            else:
+                st.warning("No support services data available.")
+            
+            if feed.has_more:
+                st.button("⬇️ Load more institutions", key="support_load_more")
     
     with col2:
         st.markdown("### 💰 ROI Calculator")
@@ -351,16 +509,27 @@ with tabs[2]:
             
             submitted = st.form_submit_button("🧮 Calculate ROI", type="primary")
         
+        # Send the catalog spelling so typos still hit the backend, cache and snapshot
+        institution = canonical_input("institution", institution, "Institution")
+        degree_roi = canonical_input("degree", degree_roi, "Degree")
+        roi_key = (" ".join(institution.split()).casefold(), " ".join(degree_roi.split()).casefold())
+        
+        saved_inputs = get_session_store().get("roi_inputs")
+        have_inputs = bool(saved_inputs) and saved_inputs[0] == roi_key
+        
         if submitted:
             with st.spinner("Calculating ROI..."):
-                resp = requests.post(f"{API_BASE}/roi", json={
-                    "institution": institution,
-                    "degree": degree_roi,
-                    "tuition_total": tuition,
-                    "years": int(years)
-                })
-                if resp.ok:
-                    data = resp.json()
+                if have_inputs:
+                    # Same institution and degree: only tuition changed, so skip the round-trip
+                    data = {**saved_inputs[2], **roi_summary(saved_inputs[1], tuition)}
+                else:
+                    data = api_client.query("roi", {
+                        "institution": institution,
+                        "degree": degree_roi,
+                        "tuition_total": tuition,
+                        "years": int(years)
+                    })
+                if data is not None:
                     
                     # Display key metrics
                     col_a, col_b = st.columns(2)
@@ -368,7 +537,8 @@ with tabs[2]:
                         st.metric("Median Salary", f"₹{data.get('median_salary', 0):,}")
                         st.metric("Employment Rate", f"{data.get('employment_rate', 0):.1f}%")
                     with col_b:
-                        st.metric("Years to Break Even", f"{data.get('estimated_years_to_break_even', 0):.1f}")
+                        st.metric("Years to Break Even", f"{data.get('estimated_years_to_break_even', 0):.1f}",
+                                  help="Counted from graduation")
                         st.metric("Risk Level", data.get('risk_level', 'Unknown'))
                     
                     # ROI projections
@@ -387,116 +557,293 @@ with tabs[2]:
                     # Data quality info
                     if 'data_quality' in data:
                         st.caption(f"📊 {data['data_quality']}")
+                    
+                    # Keep the salary/employment inputs for local what-if sweeps and resubmits
+                    roi_inputs = RoiInputs.from_response(data)
+                    if roi_inputs is not None and not have_inputs:
+                        details = {k: data[k] for k in ("risk_level", "salary_range", "data_quality") if k in data}
+                        saved_inputs = (roi_key, roi_inputs, details)
+                        get_session_store().put("roi_inputs", saved_inputs)
                         
                 else:
                     st.error("❌ Failed to calculate ROI. Please check your inputs.")
+        
+        # What-if sweeps run locally on the last fetched inputs for this institution and degree
+        if saved_inputs and saved_inputs[0] == roi_key:
+            roi_inputs = saved_inputs[1]
+            with st.expander("🧪 What-if Analysis", expanded=True):
+                st.caption("Computed locally from the salary and employment data above, without further backend calls.")
+                growth_pct = st.slider("📈 Annual salary growth (%)", 0.0, 15.0, 5.0, 0.5, key="roi_growth")
+                horizon = st.slider("🗓️ Years after graduation", 3, 20, 10, key="roi_horizon")
+                growth = growth_pct / 100
+                
+                # Break-even per risk band, counted from graduation like the figure above
+                band_cols = st.columns(3)
+                for col, (band, (salary, rate)) in zip(band_cols, roi_inputs.bands().items()):
+                    be_years = float(break_even_years(tuition, salary, rate, growth))
+                    label = f"{be_years:.1f} yrs" if be_years != float("inf") else "Never"
+                    col.metric(f"{band} Break Even", label, help=f"₹{salary:,.0f} salary, {rate:.0f}% employed")
+                
+                curves = roi_curves(roi_inputs, tuition, horizon, growth)
+                show_chart(line_chart(curves, x="year", y="roi_percent", color="band",
+                                      title="ROI by Year After Graduation",
+                                      xaxis_title="Years after graduation", yaxis_title="ROI (%)"))
+                
+                tuitions, growths, grid = break_even_sweep(roi_inputs, tuition)
+                show_chart(heatmap(grid, x=tuitions, y=growths * 100,
+                                   title="Years to Break Even (expected case)",
+                                   labels={"x": "Total Tuition (₹)", "y": "Salary Growth (%)", "color": "Years"}))
 
 with tabs[3]:
     st.subheader("⚖️ Institution Comparison Tool")
-    st.markdown("Compare two institutions across multiple metrics to make informed decisions.")
+    st.markdown("Compare two institutions side by side, or rank many institutions at once.")
     
-    with st.form("comparison_form"):
-        col1, col2, col3 = st.columns(3)
+    compare_mode = st.radio(
+        "Comparison mode",
+        ["Two institutions", "Multiple institutions"],
+        horizontal=True,
+        key="compare_mode",
+        help="Multiple mode ranks any number of institutions in one batched request"
+    )
+    
+    if compare_mode == "Two institutions":
+        with st.form("comparison_form"):
+            col1, col2, col3 = st.columns(3)
         
-        with col1:
-            inst_a = st.text_input(
-                "🏛️ Institution A", 
-                placeholder="e.g., VIT University, IIT Delhi", 
-                key="inst_a",
-                help="First institution to compare"
-            )
+            with col1:
+                inst_a = st.text_input(
+                    "🏛️ Institution A", 
+                    placeholder="e.g., VIT University, IIT Delhi", 
+                    key="inst_a",
+                    help="First institution to compare"
+                )
         
-        with col2:
-            inst_b = st.text_input(
-                "🏛️ Institution B", 
-                placeholder="e.g., SRM University, IIT Bombay", 
-                key="inst_b",
-                help="Second institution to compare"
-            )
+            with col2:
+                inst_b = st.text_input(
+                    "🏛️ Institution B", 
+                    placeholder="e.g., SRM University, IIT Bombay", 
+                    key="inst_b",
+                    help="Second institution to compare"
+                )
         
-        with col3:
-            cmp_year = st.number_input(
-                "📅 Graduation Year", 
-                min_value=2020, max_value=2035, value=2025, step=1, 
-                key="year_compare",
-                help="Year for comparison"
-            )
+            with col3:
+                cmp_year = st.number_input(
+                    "📅 Graduation Year", 
+                    min_value=2020, max_value=2035, value=2025, step=1, 
+                    key="year_compare",
+                    help="Year for comparison"
+                )
         
-        submitted = st.form_submit_button("🔄 Compare Institutions", type="primary")
+            submitted = st.form_submit_button("🔄 Compare Institutions", type="primary")
+    
+        cmp_year_val = int(cmp_year) if cmp_year else None
+        inst_a = canonical_input("institution", inst_a, "Institution A")
+        inst_b = canonical_input("institution", inst_b, "Institution B")
     
-    cmp_year_val = int(cmp_year) if cmp_year else None
+        compare_payload = {
+            "institution_a": inst_a,
+            "institution_b": inst_b,
+            "year": cmp_year_val
+        }
+        compare_key = normalize_payload(compare_payload)
+        # A comparison still running for these inputs survives unrelated reruns
+        pending = get_executor().latest("compare", compare_key)
     
-    if submitted:
-        if inst_a == inst_b:
+        if submitted and inst_a == inst_b:
             st.warning("⚠️ Please select two different institutions for comparison.")
-        else:
-            with st.spinner("Comparing institutions..."):
-                resp = requests.post(f"{API_BASE}/compare", json={
-                    "institution_a": inst_a,
-                    "institution_b": inst_b,
-                    "year": cmp_year_val
-                })
-                if resp.ok:
-                    data = resp.json()
+        elif submitted or pending is not None:
+            executor = get_executor()
+            if submitted:
+                request = executor.submit("compare", compare_key,
+                                          lambda cancelled: api_client.query("compare", compare_payload,
+                                                                             cancelled=cancelled))
+            else:
+                request = pending
+            data = executor.wait(request, "Comparing institutions...")
+            if data is not None:
+            
+                # Display comparison summary
+                st.success(data.get("summary"))
+                freshness_badge(data)
+            
+                # Show data quality
+                if "data_quality" in data:
+                    st.info(f"📊 {data['data_quality']}")
+            
+                # Display comparison results
+                df = api_client.as_frame(data.get("comparison"))
+                if not df.empty:
+                
+                    # Create comparison charts
+                    col_a, col_b = st.columns(2)
+                
+                    with col_a:
+                        fig_emp = bar_chart(df, x="institution", y="avg_employment_rate", 
+                                            title="Employment Rate Comparison",
+                                            color_scale="RdYlGn")
+                        show_chart(fig_emp)
+                
+                    with col_b:
+                        fig_salary = bar_chart(df, x="institution", y="avg_salary", 
+                                               title="Average Salary Comparison",
+                                               color_scale="Blues")
+                        show_chart(fig_salary)
+                
+                    # Display detailed comparison table
+                    st.subheader("📊 Detailed Comparison")
+                    comparison_df = df[['institution', 'avg_employment_rate', 'avg_salary', 
+                                      'employment_std', 'salary_std']].copy()
+                    comparison_df.columns = ['Institution', 'Employment Rate (%)', 'Avg Salary (₹)', 
+                                          'Employment Std Dev', 'Salary Std Dev']
+                    st.dataframe(comparison_df, use_container_width=True)
+                
+                    # Calculate and display winner
+                    if len(df) == 2:
+                        leaders = metric_leaders(df)
                     
-                    # Display comparison summary
-                    st.success(data.get("summary"))
+                        st.subheader("🏆 Comparison Results")
+                        col_c, col_d = st.columns(2)
                     
-                    # Show data quality
-                    if "data_quality" in data:
-                        st.info(f"📊 {data['data_quality']}")
+                        with col_c:
+                            if "avg_employment_rate" in leaders:
+                                st.success(f"🥇 {leaders['avg_employment_rate']} wins in Employment Rate")
                     
-                    # Display comparison results
-                    rows = data.get("comparison", [])
-                    if rows:
-                        df = pd.DataFrame(rows)
-                        
-                        # Create comparison charts
-                        col_a, col_b = st.columns(2)
-                        
-                        with col_a:
-                            fig_emp = px.bar(df, x="institution", y="avg_employment_rate", 
-                                           title="Employment Rate Comparison",
-                                           color="avg_employment_rate",
-                                           color_continuous_scale="RdYlGn")
-                            st.plotly_chart(fig_emp, use_container_width=True)
-                        
-                        with col_b:
-                            fig_salary = px.bar(df, x="institution", y="avg_salary", 
-                                              title="Average Salary Comparison",
-                                              color="avg_salary",
-                                              color_continuous_scale="Blues")
-                            st.plotly_chart(fig_salary, use_container_width=True)
-                        
-                        # Display detailed comparison table
-                        st.subheader("📊 Detailed Comparison")
-                        comparison_df = df[['institution', 'avg_employment_rate', 'avg_salary', 
-                                          'employment_std', 'salary_std']].copy()
-                        comparison_df.columns = ['Institution', 'Employment Rate (%)', 'Avg Salary (₹)', 
-                                              'Employment Std Dev', 'Salary Std Dev']
-                        st.dataframe(comparison_df, use_container_width=True)
-                        
-                        # Calculate and display winner
-                        if len(df) == 2:
-                            inst_a_data = df[df['institution'] == inst_a].iloc[0]
-                            inst_b_data = df[df['institution'] == inst_b].iloc[0]
-                            
-                            st.subheader("🏆 Comparison Results")
-                            col_c, col_d = st.columns(2)
-                            
-                            with col_c:
-                                if inst_a_data['avg_employment_rate'] > inst_b_data['avg_employment_rate']:
-                                    st.success(f"🥇 {inst_a} wins in Employment Rate")
-                                else:
-                                    st.success(f"🥇 {inst_b} wins in Employment Rate")
-                            
-                            with col_d:
-                                if inst_a_data['avg_salary'] > inst_b_data['avg_salary']:
-                                    st.success(f"💰 {inst_a} wins in Average Salary")
-                                else:
-                                    st.success(f"💰 {inst_b} wins in Average Salary")
-                    else:
-                        st.warning("No comparison data available for the selected institutions and year.")
-                        
+                        with col_d:
+                            if "avg_salary" in leaders:
+                                st.success(f"💰 {leaders['avg_salary']} wins in Average Salary")
                 else:
-                    st.error("❌ Failed to compare institutions. Please check if the backend is running.")
+                    st.warning("No comparison data available for the selected institutions and year.")
+                
+            elif not request.cancelled.is_set():
+                st.error("❌ Failed to compare institutions. Please check if the backend is running.")
+    
+    else:
+        with st.form("multi_comparison_form"):
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                inst_text = st.text_area(
+                    "🏛️ Institutions",
+                    placeholder="One per line or comma separated, e.g.\nVIT University\nIIT Delhi\nSRM University",
+                    key="inst_multi",
+                    height=150,
+                    help="Institutions to rank against each other"
+                )
+            
+            with col2:
+                multi_year = st.number_input(
+                    "📅 Graduation Year",
+                    min_value=2020, max_value=2035, value=2025, step=1,
+                    key="year_compare_multi",
+                    help="Year for comparison"
+                )
+            
+            multi_submitted = st.form_submit_button("🔄 Rank Institutions", type="primary")
+        
+        institutions = list(dict.fromkeys(
+            canonical_input("institution", name) for name in parse_institutions(inst_text)))
+        multi_key = normalize_payload({"institutions": institutions, "year": int(multi_year)})
+        pending = get_executor().latest("compare_multi", multi_key)
+        
+        if multi_submitted and len(institutions) < 2:
+            st.warning("⚠️ Please enter at least two different institutions.")
+        elif multi_submitted or pending is not None:
+            executor = get_executor()
+            if multi_submitted:
+                request = executor.submit("compare_multi", multi_key,
+                                          lambda cancelled: compare_institutions(institutions, int(multi_year),
+                                                                                 cancelled))
+            else:
+                request = pending
+            data = executor.wait(request, f"Comparing {len(institutions)} institutions...")
+            df = api_client.as_frame(data.get("comparison") if data is not None else None)
+            if not df.empty:
+                st.success(data.get("summary"))
+                freshness_badge(data)
+                if "data_quality" in data:
+                    st.info(f"📊 {data['data_quality']}")
+                
+                df = rank_institutions(df)
+                missing = set(institutions) - set(df["institution"])
+                if missing:
+                    st.caption(f"No data returned for: {', '.join(sorted(missing))}")
+                
+                # Leaders per metric
+                st.subheader("🏆 Leaders")
+                leader_cols = st.columns(len(METRICS))
+                leaders = metric_leaders(df)
+                for col, (metric, label) in zip(leader_cols, METRICS.items()):
+                    with col:
+                        if metric in leaders:
+                            st.success(f"🥇 {leaders[metric]} leads in {label}")
+                
+                # Combined horizontal charts, best first, sized to the number of institutions
+                chart_height = max(350, 28 * len(df))
+                col_a, col_b = st.columns(2)
+                with col_a:
+                    fig_emp = bar_chart(df, x="avg_employment_rate", y="institution", orientation="h",
+                                        title="Employment Rate Ranking",
+                                        color_scale="RdYlGn",
+                                        yaxis={"categoryorder": "total ascending"}, height=chart_height)
+                    show_chart(fig_emp)
+                with col_b:
+                    fig_salary = bar_chart(df, x="avg_salary", y="institution", orientation="h",
+                                           title="Average Salary Ranking",
+                                           color_scale="Blues",
+                                           yaxis={"categoryorder": "total ascending"}, height=chart_height)
+                    show_chart(fig_salary)
+                
+                # Ranked table
+                st.subheader("📊 Ranking")
+                ranking_df = df[['overall_rank', 'institution', 'avg_employment_rate', 'avg_employment_rate_rank',
+                                 'avg_salary', 'avg_salary_rank']].copy()
+                ranking_df.columns = ['Overall Rank', 'Institution', 'Employment Rate (%)', 'Employment Rank',
+                                      'Avg Salary (₹)', 'Salary Rank']
+                st.dataframe(ranking_df, use_container_width=True, hide_index=True)
+            elif data is not None:
+                st.warning("No comparison data available for the selected institutions and year.")
+            elif not request.cancelled.is_set():
+                st.error("❌ Failed to compare institutions. Please check if the backend is running.")
+
+# Performance panel
+perf.end_run()
+if show_perf:
+    with perf_panel:
+        run_spans = perf.session_spans(current_run_only=True)
+        rerun_ms = sum(s["ms"] for s in run_spans if s["kind"] == "rerun")
+        network_ms = sum(s["ms"] for s in run_spans if s["kind"] == "request")
+        received = sum(s.get("bytes", 0) for s in run_spans if s["kind"] == "request")
+        col_p, col_q = st.columns(2)
+        col_p.metric("Rerun", f"{rerun_ms:.0f} ms")
+        col_q.metric("Backend", f"{network_ms:.0f} ms")
+        lookups = [s for s in run_spans if s["kind"] == "cache"]
+        st.caption(
+            f"{received / 1024:.1f} KiB received · "
+            f"{sum(s['hit'] for s in lookups)}/{len(lookups)} cache hits"
+        )
+        st.dataframe(
+            [{"step": s["kind"], "name": s["name"], "ms": round(s["ms"], 1), "bytes": s.get("bytes"),
+              "detail": str(s.get("status", s.get("hit", s.get("format", ""))))}
+             for s in run_spans if s["kind"] != "rerun"],
+            use_container_width=True,
+            hide_index=True,
+        )
+if show_memory:
+    with perf_panel:
+        session_sizes = session_report()
+        store = get_session_store()
+        process = process_report()
+        col_p, col_q = st.columns(2)
+        col_p.metric("Session", format_bytes(sum(size for key, size in session_sizes if not key.startswith("store:"))
+                                             + store.nbytes))
+        col_q.metric("Process RSS", format_bytes(process["rss"]))
+        st.caption(
+            f"Store {format_bytes(store.nbytes)} of {format_bytes(store.budget)} · {store.evictions} evicted · "
+            f"{process['sessions']} sessions hold {format_bytes(process['store_bytes'])} "
+            f"(largest {format_bytes(process['largest_store'])})"
+        )
+        st.dataframe(
+            [{"key": key, "size": format_bytes(size)} for key, size in session_sizes[:15]],
+            use_container_width=True,
+            hide_index=True,
+        )
@@ -0,0 +1,238 @@
+"""In-memory index of known institution and degree names.
+
+Free-text names are canonicalized against this index before any request goes
+out, so "vit univ" and "VIT University" hit the same backend row, cache entry
+and snapshot row. One ``Catalog`` per server process loads the names from the
+backend's ``/catalog`` endpoint, or pages through ``/support-services`` when
+the backend has no catalog, and reloads them every
+``CATALOG_REFRESH_INTERVAL`` seconds on a daemon thread.
+
+Lookups never touch the network. A typed name is only rewritten on an exact
+match after abbreviation expansion (a dict probe) or a unique prefix (a bisect
+over the sorted normalized names). Trigram similarity, scored through an
+inverted index of NumPy posting arrays (built on the first suggestion, so
+NumPy isn't loaded at start-up), only drives "did you mean"
+suggestions: names sharing filler words like "university" or "engineering"
+look alike to it, so it never replaces what the user typed.
+"""
+import logging
+import os
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+import requests
+import streamlit as st
+
+import api_client
+
+CATALOG_REFRESH_INTERVAL = float(os.environ.get("CATALOG_REFRESH_INTERVAL", "3600"))
+SUGGESTIONS = 5
+# Page size used when the catalog has to be built from /support-services
+CATALOG_PAGE_LIMIT = 1000
+
+# Used until the backend tells us otherwise
+DEFAULT_DEGREES = [
+    "Computer Science", "Information Technology", "Data Science", "Artificial Intelligence",
+    "Electronics and Communication", "Electrical Engineering", "Mechanical Engineering",
+    "Civil Engineering", "Chemical Engineering", "Biotechnology", "Engineering",
+    "Business Administration", "Commerce", "Economics", "Mathematics", "Physics",
+]
+
+ABBREVIATIONS = {
+    "univ": "university", "uni": "university", "inst": "institute", "tech": "technology",
+    "engg": "engineering", "eng": "engineering", "sci": "science", "cs": "computer science",
+    "cse": "computer science", "it": "information technology", "ece": "electronics and communication",
+    "ai": "artificial intelligence", "mba": "business administration",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_name(name):
+    """Casefold, drop punctuation and expand common abbreviations."""
+    words = re.sub(r"[^\w\s]", " ", str(name).casefold()).split()
+    return " ".join(ABBREVIATIONS.get(w, w) for w in words)
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Prefix and trigram lookups over one list of canonical names."""
+
+    def __init__(self, names):
+        by_key = {}
+        for name in names:
+            if name and str(name).strip():
+                by_key.setdefault(normalize_name(name), " ".join(str(name).split()))
+        self._keys = sorted(by_key)
+        self.names = [by_key[k] for k in self._keys]
+        self._exact = {k: i for i, k in enumerate(self._keys)}
+        postings = defaultdict(list)
+        sizes = []
+        for i, key in enumerate(self._keys):
+            grams = trigrams(key)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings[gram].append(i)
+        self._postings = dict(postings)
+        self._sizes = sizes
+        self._arrays = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return normalize_name(name) in self._exact
+
+    def prefix(self, query, limit=SUGGESTIONS):
+        """Names whose normalized form starts with the normalized ``query``."""
+        key = normalize_name(query)
+        if not key:
+            return []
+        matches = []
+        for i in range(bisect_left(self._keys, key), len(self._keys)):
+            if not self._keys[i].startswith(key) or len(matches) == limit:
+                break
+            matches.append(self.names[i])
+        return matches
+
+    def fuzzy(self, query, limit=SUGGESTIONS):
+        """``(name, score)`` pairs ranked by trigram Dice similarity."""
+        import numpy as np
+
+        postings, sizes = self._posting_arrays()
+        grams = trigrams(normalize_name(query))
+        hits = [postings[g] for g in grams if g in postings]
+        if not hits:
+            return []
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.names))
+        scores = 2 * shared / (len(grams) + sizes)
+        top = np.argpartition(-scores, limit - 1)[:limit] if len(scores) > limit else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.names[i], float(scores[i])) for i in top if shared[i]]
+
+    def _posting_arrays(self):
+        if self._arrays is None:
+            import numpy as np
+
+            self._arrays = ({gram: np.array(ids, dtype=np.int32) for gram, ids in self._postings.items()},
+                            np.array(self._sizes, dtype=np.float32))
+        return self._arrays
+
+    def match(self, query):
+        """Return ``(canonical_name, score)`` for an exact or unique-prefix match, or ``None``.
+
+        Fuzzy hits are deliberately not matches: "IIIT Delhi" is not a typo of
+        "IIT Delhi". Use ``suggest`` to offer them instead.
+        """
+        key = normalize_name(query)
+        if not key:
+            return None
+        if key in self._exact:
+            return self.names[self._exact[key]], 1.0
+        # A prefix of several names ("IIT") is ambiguous, so only a unique one counts
+        candidates = self.prefix(query, limit=2)
+        return (candidates[0], 1.0) if len(candidates) == 1 else None
+
+    def suggest(self, query, limit=SUGGESTIONS):
+        """Prefix matches first, then the closest fuzzy matches."""
+        names = self.prefix(query, limit)
+        names += [n for n, _ in self.fuzzy(query, limit) if n not in names]
+        return names[:limit]
+
+
+class Catalog:
+    def __init__(self, interval=CATALOG_REFRESH_INTERVAL):
+        self.interval = interval
+        # Resolved on the script thread so the refresh thread never touches Streamlit's cache
+        self._session = api_client.get_session()
+        self.institutions = NameIndex([])
+        self.degrees = NameIndex(DEFAULT_DEGREES)
+        self.loaded = threading.Event()
+        self._stop = threading.Event()
+        threading.Thread(target=self._run, name="catalog-refresh", daemon=True).start()
+
+    def canonicalize(self, kind, name):
+        """Return ``(name_to_send, matched)`` where ``matched`` is true if the name was rewritten."""
+        index = self.institutions if kind == "institution" else self.degrees
+        match = index.match(name)
+        if match is None or match[0] == name:
+            return name, False
+        return match[0], True
+
+    def refresh(self):
+        catalog = self._get("/catalog")
+        if catalog is not None and catalog.get("institutions"):
+            institutions = catalog["institutions"]
+            degrees = catalog.get("degrees") or DEFAULT_DEGREES
+        else:
+            institutions, degrees = self._support_institutions(), DEFAULT_DEGREES
+        if institutions:
+            # Swap whole indexes so readers never see a half-built one
+            self.institutions = NameIndex(institutions)
+            self.degrees = NameIndex(degrees)
+            logger.info("Catalog loaded: %d institutions, %d degrees", len(self.institutions), len(self.degrees))
+        self.loaded.set()
+
+    def stop(self):
+        self._stop.set()
+
+    def _support_institutions(self):
+        names, cursor = [], None
+        while True:
+            params = {"limit": CATALOG_PAGE_LIMIT, **({"cursor": cursor} if cursor is not None else {})}
+            data = self._get("/support-services", params)
+            if data is None:
+                break
+            names += [row.get("institution") for row in data.get("institutions") or []]
+            cursor = data.get("next_cursor")
+            if cursor is None:
+                break
+        return names
+
+    def _get(self, path, params=None):
+        try:
+            resp = self._session.get(f"{api_client.API_BASE}{path}", params=params,
+                                     timeout=api_client.TIMEOUTS.get(path, api_client.DEFAULT_TIMEOUT))
+        except requests.RequestException:
+            return None
+        if not resp.ok:
+            return None
+        try:
+            return resp.json()
+        except ValueError:
+            return None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Catalog refresh failed")
+            self._stop.wait(self.interval)
+
+
+@st.cache_resource
+def get_catalog():
+    return Catalog()
+
+
+def canonical_input(kind, name, label=None):
+    """Canonicalize a typed name and say so in the UI; suggests close names on a miss."""
+    catalog = get_catalog()
+    canonical, matched = catalog.canonicalize(kind, name)
+    prefix = f"{label}: " if label else ""
+    if matched:
+        st.caption(f"🔎 {prefix}matched “{name}” → **{canonical}**")
+    else:
+        index = catalog.institutions if kind == "institution" else catalog.degrees
+        if name and len(index) and name not in index:
+            suggestions = index.suggest(name, limit=3)
+            if suggestions:
+                st.caption(f"🤔 {prefix}“{name}” isn't a known {kind}. Did you mean {', '.join(suggestions)}?")
+    return canonical
@@ -0,0 +1,173 @@
+"""Chart builders.
+
+Plotly and pandas are imported on first use rather than at app start-up, so
+a cold worker only pays for them once a tab actually draws a chart. Long
+category series are cut to the top N rows with the remainder folded into a
+single "Other" bar.
+
+Every chart stays within a point budget before it is built: bar charts keep
+the top ``CHART_POINT_BUDGET`` categories, line series are thinned by
+striding and heatmaps are subsampled to ``HEATMAP_CELL_BUDGET`` cells. Built
+figures are kept in a process-wide LRU keyed by a hash of the plotted columns
+and the chart spec, so reruns and other sessions showing the same data skip
+Plotly Express entirely. Line charts switch to the WebGL renderer above
+``WEBGL_THRESHOLD`` points (``CHART_RENDERER`` forces ``svg`` or ``webgl``).
+"""
+import hashlib
+import json
+import math
+import os
+import threading
+
+import streamlit as st
+from cachetools import LRUCache
+
+import perf
+
+# Bars drawn before the remainder is aggregated
+TOP_N_CHART = 25
+CHART_POINT_BUDGET = int(os.environ.get("CHART_POINT_BUDGET", "200"))
+HEATMAP_CELL_BUDGET = int(os.environ.get("HEATMAP_CELL_BUDGET", "5000"))
+CHART_RENDERER = os.environ.get("CHART_RENDERER", "auto")  # auto, svg or webgl
+WEBGL_THRESHOLD = 1000
+FIGURE_CACHE_SIZE = int(os.environ.get("FIGURE_CACHE_SIZE", "128"))
+
+
+class FigureCache:
+    """Built figures shared by all sessions; callers must not mutate them."""
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        self._lock = threading.Lock()
+        self._figures = LRUCache(maxsize=maxsize)
+
+    def get_or_build(self, key, title, build):
+        with self._lock:
+            fig = self._figures.get(key)
+        perf.event("figure", title, hit=fig is not None)
+        if fig is None:
+            fig = build()
+            with self._lock:
+                self._figures[key] = fig
+        return fig
+
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+
+def _digest(*parts):
+    """Stable hash of DataFrames, arrays and plain values making up a chart."""
+    import numpy as np
+    import pandas as pd
+
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, pd.DataFrame):
+            h.update(json.dumps(list(map(str, part.columns))).encode())
+            h.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+        elif isinstance(part, np.ndarray):
+            h.update(str((part.dtype, part.shape)).encode())
+            h.update(np.ascontiguousarray(part).tobytes())
+        else:
+            h.update(json.dumps(part, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def _use_webgl(points):
+    if CHART_RENDERER == "auto":
+        return points > WEBGL_THRESHOLD
+    return CHART_RENDERER == "webgl"
+
+
+def bar_chart(df, x, y, title, color_scale, orientation="v", budget=CHART_POINT_BUDGET, **layout):
+    """Build a bar chart coloured by its value axis, keeping the top ``budget`` bars."""
+    label, value = (x, y) if orientation == "v" else (y, x)
+    if len(df) > budget:
+        df = top_n_with_other(df, label, value, n=budget)
+    df = df[[x, y]]
+    key = _digest("bar", df, title, color_scale, orientation, layout)
+
+    def build():
+        with perf.span("chart", title, points=len(df)):
+            import plotly.express as px
+
+            fig = px.bar(df, x=x, y=y, title=title, orientation=orientation,
+                         color=value, color_continuous_scale=color_scale)
+            if layout:
+                fig.update_layout(**layout)
+        return fig
+
+    return get_figure_cache().get_or_build(key, title, build)
+
+
+def line_chart(df, x, y, color, title, budget=CHART_POINT_BUDGET, **layout):
+    """Build a multi-series line chart with one line per ``color`` value.
+
+    Series longer than ``budget`` points are thinned to every k-th point,
+    always keeping the last one.
+    """
+    df = df[[x, y, color]]
+    longest = df.groupby(color, sort=False).size().max() if len(df) else 0
+    if longest > budget:
+        step = math.ceil(longest / budget)
+        position = df.groupby(color, sort=False).cumcount()
+        last = position == df.groupby(color, sort=False)[x].transform("size") - 1
+        df = df[(position % step == 0) | last]
+    key = _digest("line", df, title, layout)
+
+    def build():
+        with perf.span("chart", title, points=len(df)):
+            import plotly.express as px
+
+            fig = px.line(df, x=x, y=y, color=color, title=title, markers=True,
+                          render_mode="webgl" if _use_webgl(len(df)) else "svg")
+            if layout:
+                fig.update_layout(**layout)
+        return fig
+
+    return get_figure_cache().get_or_build(key, title, build)
+
+
+def heatmap(z, x, y, title, labels, color_scale="RdYlGn_r", budget=HEATMAP_CELL_BUDGET, **layout):
+    """Build a heatmap of the 2-D array ``z`` over axes ``x`` (columns) and ``y`` (rows).
+
+    Grids larger than ``budget`` cells are subsampled with the same stride on both axes.
+    """
+    if z.size > budget:
+        step = math.ceil(math.sqrt(z.size / budget))
+        z, x, y = z[::step, ::step], x[::step], y[::step]
+    key = _digest("heatmap", z, x, y, title, labels, color_scale, layout)
+
+    def build():
+        with perf.span("chart", title, points=z.size):
+            import plotly.express as px
+
+            fig = px.imshow(z, x=x, y=y, labels=labels, title=title, origin="lower",
+                            aspect="auto", color_continuous_scale=color_scale)
+            if layout:
+                fig.update_layout(**layout)
+        return fig
+
+    return get_figure_cache().get_or_build(key, title, build)
+
+
+def show_chart(fig):
+    """Hand a figure to Streamlit, timing the serialization under a ``render`` span."""
+    with perf.span("render", fig.layout.title.text or "chart"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+def top_n_with_other(df, label, value, n=TOP_N_CHART, agg="mean", other_label="Other"):
+    """Return the ``n`` largest rows by ``value`` plus one aggregated ``Other`` row."""
+    import pandas as pd
+
+    if len(df) <= n:
+        return df[[label, value]]
+    top = df.nlargest(n, value)[[label, value]]
+    rest = df[value].drop(top.index)
+    other = pd.DataFrame({
+        label: [f"{other_label} ({len(rest)})"],
+        value: [rest.agg(agg)],
+    })
+    return pd.concat([top, other], ignore_index=True)
@@ -0,0 +1,86 @@
+"""N-way institution comparison.
+
+Sends one batched ``/compare`` request for all institutions and ranks the
+result with vectorized pandas operations instead of filtering the frame once
+per institution. Once a backend rejects the batched shape, this process
+goes straight to pairwise requests from then on.
+"""
+import api_client
+from prefetch import fetch_many
+
+# metric column -> label, higher is better for all of them
+METRICS = {
+    "avg_employment_rate": "Employment Rate",
+    "avg_salary": "Average Salary",
+}
+
+# Set once the backend has shown it only understands pairwise /compare requests
+_batch_unsupported = False
+
+
+def parse_institutions(text):
+    """Split free text (one per line or comma separated) into unique names, keeping order."""
+    names = (part.strip() for line in text.splitlines() for part in line.split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def compare_institutions(institutions, year, cancelled=None):
+    """Fetch comparison rows for any number of institutions.
+
+    Tries a single batched ``{"institutions": [...]}`` request first. Backends
+    that only understand ``institution_a``/``institution_b`` are covered by
+    running the pairwise requests concurrently and concatenating the rows.
+    Returns ``{"comparison": rows_or_frame, ...}`` or ``None`` if nothing came
+    back or ``cancelled`` was set along the way.
+    """
+    global _batch_unsupported
+    if not _batch_unsupported:
+        failures = []
+        data = api_client.query("compare", {"institutions": institutions, "year": year},
+                                failures=failures, cancelled=cancelled)
+        if data is not None and "comparison" in data:
+            return data
+        if "connection" in failures:
+            return None  # backend is down; N/2 pairwise calls would only retry into the same wall
+        if data is not None or any(isinstance(f, int) and 400 <= f < 500 for f in failures):
+            _batch_unsupported = True
+    if cancelled is not None and cancelled.is_set():
+        return None
+
+    pairs = [institutions[i:i + 2] for i in range(0, len(institutions), 2)]
+    if len(pairs[-1]) == 1:
+        pairs[-1] = [institutions[0], pairs[-1][0]]
+    calls = [("compare", {"institution_a": a, "institution_b": b, "year": year}) for a, b in pairs]
+    results = [r for r in fetch_many(calls) if r is not None]
+    if not results:
+        return None
+
+    import pandas as pd
+
+    frames = [api_client.as_frame(r.get("comparison")) for r in results]
+    quality = [r["data_quality"] for r in results if "data_quality" in r]
+    taken_at = [r["_snapshot_at"] for r in results if r.get("_snapshot_at")]
+    return {
+        "summary": f"Compared {len(institutions)} institutions for {year}.",
+        "comparison": pd.concat(frames, ignore_index=True),
+        **({"data_quality": quality[0]} if quality else {}),
+        **({"_snapshot_at": min(taken_at)} if taken_at else {}),
+    }
+
+
+def rank_institutions(df):
+    """Add per-metric ranks (1 = best) and an overall rank, sorted best first."""
+    df = df.drop_duplicates("institution").reset_index(drop=True)
+    metrics = [m for m in METRICS if m in df.columns]
+    ranks = df[metrics].rank(ascending=False, method="min")
+    for metric in metrics:
+        df[f"{metric}_rank"] = ranks[metric].astype("Int64")
+    df["overall_rank"] = ranks.mean(axis=1).rank(method="min").astype("Int64")
+    return df.sort_values("overall_rank", kind="stable").reset_index(drop=True)
+
+
+def metric_leaders(df):
+    """Return ``{metric: institution}`` for the best institution on each metric."""
+    metrics = [m for m in METRICS if m in df.columns and df[m].notna().any()]
+    leaders = df[metrics].idxmax()
+    return {metric: df.at[leaders[metric], "institution"] for metric in metrics}
@@ -0,0 +1,174 @@
+"""Background execution of slow backend calls, one slot per kind of request.
+
+Streamlit reruns the script on every widget change and stops the current run
+part-way through. A blocking ``/insights`` or ``/compare`` call on the script
+thread is simply lost when that happens. Instead, each session keeps a
+``SessionExecutor`` whose requests run on a process-wide thread pool:
+
+* every request gets an id and lives in a named slot; only the newest request
+  of a slot is ever rendered, older ones are cancelled or ignored;
+* resubmitting the same inputs returns the request already running, and a
+  request submitted within ``REQUEST_DEBOUNCE`` seconds of the previous one
+  waits out that window first, so a burst of clicks costs one backend call;
+* a cancelled request that has not reached the backend yet frees its worker
+  immediately. One already waiting on the backend runs to completion, but its
+  result is dropped.
+
+The newest result of each slot is kept in the session's bounded
+``SessionStore`` rather than on the request, so a large comparison frame
+counts against the session budget. A result evicted from there (or one
+larger than the whole budget) reads as failed, and resubmitting the same
+inputs simply fetches it again.
+
+The script polls the request with a placeholder instead of blocking, so a
+rerun interrupts the wait at once and the next run picks the request up again.
+
+Workers run with the submitting session's ``ScriptRunContext`` attached, so
+``st.cache_resource`` lookups inside the call resolve without warnings and
+``perf`` spans land in that session's Performance panel.
+"""
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+
+import perf
+from session_store import get_session_store
+
+REQUEST_WORKERS = int(os.environ.get("REQUEST_WORKERS", "16"))
+REQUEST_DEBOUNCE = float(os.environ.get("REQUEST_DEBOUNCE", "0.4"))
+POLL_INTERVAL = 0.1
+
+
+class BackgroundRequest:
+    def __init__(self, request_id, slot, key, store):
+        self.id = request_id
+        self.slot = slot
+        self.key = key
+        self.store = store
+        self.submitted_at = time.perf_counter()
+        self.cancelled = threading.Event()
+        self.future = None
+
+    @property
+    def done(self):
+        return self.future.done()
+
+    @property
+    def store_key(self):
+        return f"result:{self.slot}"
+
+    @property
+    def failed(self):
+        """Finished without a usable result (or it was evicted), so the same inputs may be retried."""
+        return self.done and (self.cancelled.is_set() or self.future.exception() is not None
+                              or self.result() is None)
+
+    def cancel(self):
+        self.cancelled.set()
+        self.future.cancel()
+
+    def result(self):
+        """The call's return value, or ``None`` if it was cancelled, failed or evicted."""
+        if self.cancelled.is_set():
+            return None
+        try:
+            if not self.future.result():
+                return None
+        except CancelledError:
+            return None
+        request_id, value = self.store.get(self.store_key, (None, None))
+        return value if request_id == self.id else None
+
+
+class SessionExecutor:
+    def __init__(self, pool, store):
+        self._pool = pool
+        self._store = store
+        self._ids = itertools.count(1)
+        self._latest = {}
+
+    def submit(self, slot, key, fn):
+        """Run ``fn(cancelled)`` in the background as the newest request of ``slot``.
+
+        ``cancelled`` is the request's cancel event; pass it on to anything
+        that may block (``api_client.query``) so a superseded request gives
+        its worker back promptly.
+
+        ``key`` identifies the inputs; submitting the key that is already
+        pending or answered returns that request instead of starting another.
+        """
+        current = self._latest.get(slot)
+        if current is not None and current.key == key and not current.failed:
+            perf.event("debounce", slot)
+            return current
+
+        delay = 0.0
+        if current is not None:
+            current.cancel()
+            delay = max(REQUEST_DEBOUNCE - (time.perf_counter() - current.submitted_at), 0.0)
+        request = BackgroundRequest(next(self._ids), slot, key, self._store)
+        ctx = get_script_run_ctx(suppress_warning=True)
+        request.future = self._pool.submit(self._run, request, fn, delay, ctx)
+        self._latest[slot] = request
+        return request
+
+    def latest(self, slot, key=None):
+        """The newest request of ``slot``, if it was made for ``key`` (any key when ``None``)."""
+        request = self._latest.get(slot)
+        if request is None or (key is not None and request.key != key):
+            return None
+        return request
+
+    def wait(self, request, message):
+        """Poll ``request`` behind a progress placeholder and return its result.
+
+        Each placeholder update gives Streamlit a chance to stop this run, so a
+        widget change never waits for the backend.
+        """
+        placeholder = st.empty()
+        with perf.span("background", request.slot, request_id=request.id):
+            while not request.done:
+                elapsed = time.perf_counter() - request.submitted_at
+                placeholder.info(f"⏳ {message} ({elapsed:.1f}s)")
+                time.sleep(POLL_INTERVAL)
+        placeholder.empty()
+        if self._latest.get(request.slot) is not request:
+            return None  # superseded while we were waiting
+        return request.result()
+
+    @staticmethod
+    def _run(request, fn, delay, ctx):
+        """Call ``fn(cancelled)`` and keep its result in the store; returns whether there was one."""
+        # A newer submit within the debounce window cancels us before any backend call
+        if request.cancelled.wait(delay):
+            return False
+        thread = threading.current_thread()
+        if ctx is not None:
+            add_script_run_ctx(thread, ctx)
+        try:
+            value = fn(request.cancelled)
+            if value is None or request.cancelled.is_set():
+                return False
+            request.store.put(request.store_key, (request.id, value))
+            return True
+        finally:
+            # An idle worker must not keep a closed session's context alive
+            setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+
+
+@st.cache_resource
+def get_request_pool():
+    return ThreadPoolExecutor(max_workers=REQUEST_WORKERS, thread_name_prefix="background-request")
+
+
+def get_executor():
+    """This session's executor, sharing the process-wide worker pool."""
+    if "_executor" not in st.session_state:
+        st.session_state["_executor"] = SessionExecutor(get_request_pool(), get_session_store())
+    return st.session_state["_executor"]
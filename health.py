@@ -0,0 +1,71 @@
+"""Background backend health monitor.
+
+One monitor thread per server process probes ``API_BASE/`` on an interval and
+keeps the latest result in memory, so rendering the sidebar never waits on the
+network.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+import streamlit as st
+
+import api_client
+
+HEALTH_CHECK_INTERVAL = float(os.environ.get("HEALTH_CHECK_INTERVAL", "15"))
+
+
+@dataclass(frozen=True)
+class HealthStatus:
+    state: str  # "unknown", "up", "degraded" or "down"
+    checked_at: float = 0.0
+    latency_ms: float = 0.0
+
+    @property
+    def age(self):
+        """Seconds since the last completed probe, or ``None`` before the first one."""
+        return time.time() - self.checked_at if self.checked_at else None
+
+
+class HealthMonitor:
+    def __init__(self, interval=HEALTH_CHECK_INTERVAL):
+        self.interval = interval
+        # Resolve the shared session here, on the script thread, so the probe
+        # thread never touches Streamlit's cache machinery.
+        self._session = api_client.get_session()
+        self._status = HealthStatus("unknown")
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="backend-health", daemon=True)
+        self._thread.start()
+
+    def status(self):
+        with self._lock:
+            return self._status
+
+    def check(self):
+        started = time.perf_counter()
+        try:
+            resp = self._session.get(f"{api_client.API_BASE}/", timeout=api_client.TIMEOUTS["/"])
+            state = "up" if resp.ok else "degraded"
+        except requests.RequestException:
+            state = "down"
+        status = HealthStatus(state, time.time(), (time.perf_counter() - started) * 1000)
+        with self._lock:
+            self._status = status
+        return status
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.interval)
+
+
+@st.cache_resource
+def get_health_monitor():
+    return HealthMonitor()
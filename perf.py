@@ -0,0 +1,190 @@
+"""Timing spans for backend calls and render steps.
+
+``span(kind, name)`` times a block and records it in three places:
+
+* the current Streamlit session (last ``SESSION_SPANS`` spans), which feeds
+  the sidebar "Performance" panel;
+* process-wide aggregates, exported in Prometheus text format on
+  ``PERF_METRICS_PORT`` when that variable is set;
+* the ``career_ui.perf`` logger as one JSON object per span (enable with
+  ``PERF_LOG=1``).
+
+Span kinds used by the app: ``request`` (backend round-trip), ``decode``
+(JSON/Arrow parsing), ``frame`` (DataFrame construction), ``chart`` (figure
+build), ``render`` (handing a chart to Streamlit), ``cache`` (response cache
+lookup), ``snapshot`` (offline snapshot lookup), ``figure`` (figure cache
+lookup), ``background`` (waiting on a background request), ``debounce`` (a
+resubmit served by the pending request) and ``rerun`` (the whole script run).
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+SESSION_SPANS = 300
+PERF_METRICS_PORT = os.environ.get("PERF_METRICS_PORT")
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger("career_ui.perf")
+if os.environ.get("PERF_LOG", "").lower() in ("1", "true", "yes"):
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+class PerfRecorder:
+    """Process-wide span aggregates, safe to update from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._count = defaultdict(int)
+        self._sum = defaultdict(float)
+        self._buckets = defaultdict(lambda: [0] * len(BUCKETS))
+        self._bytes = defaultdict(int)
+        self._cache = defaultdict(int)
+
+    def record(self, span):
+        key = (span["kind"], span["name"])
+        seconds = span["ms"] / 1000
+        with self._lock:
+            self._count[key] += 1
+            self._sum[key] += seconds
+            buckets = self._buckets[key]
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+            if "bytes" in span:
+                self._bytes[span["name"]] += span["bytes"]
+            if "hit" in span:
+                self._cache[(span["kind"], span["name"], "hit" if span["hit"] else "miss")] += 1
+
+    def prometheus(self):
+        """Render the aggregates in Prometheus text exposition format."""
+        lines = [
+            "# HELP career_ui_span_seconds Duration of instrumented UI steps.",
+            "# TYPE career_ui_span_seconds histogram",
+        ]
+        with self._lock:
+            for (kind, name), count in sorted(self._count.items()):
+                labels = f'kind="{kind}",name="{_escape(name)}"'
+                for bound, n in zip(BUCKETS, self._buckets[(kind, name)]):
+                    lines.append(f'career_ui_span_seconds_bucket{{{labels},le="{bound}"}} {n}')
+                lines.append(f'career_ui_span_seconds_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f"career_ui_span_seconds_sum{{{labels}}} {self._sum[(kind, name)]:.6f}")
+                lines.append(f"career_ui_span_seconds_count{{{labels}}} {count}")
+            lines += [
+                "# HELP career_ui_response_bytes_total Backend response bytes received.",
+                "# TYPE career_ui_response_bytes_total counter",
+            ]
+            lines += [f'career_ui_response_bytes_total{{path="{_escape(name)}"}} {n}'
+                      for name, n in sorted(self._bytes.items())]
+            lines += [
+                "# HELP career_ui_cache_lookups_total Response cache and snapshot lookups by result.",
+                "# TYPE career_ui_cache_lookups_total counter",
+            ]
+            lines += [f'career_ui_cache_lookups_total{{store="{store}",endpoint="{_escape(name)}",result="{result}"}} {n}'
+                      for (store, name, result), n in sorted(self._cache.items())]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_recorder = PerfRecorder()
+
+
+def get_recorder():
+    return _recorder
+
+
+@contextmanager
+def span(kind, name, **attrs):
+    """Time the enclosed block; callers can add attributes to the yielded dict."""
+    record = {"kind": kind, "name": name, **attrs}
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["ms"] = (time.perf_counter() - started) * 1000
+        _finish(record)
+
+
+def event(kind, name, **attrs):
+    """Record an instantaneous span, e.g. a cache lookup."""
+    _finish({"kind": kind, "name": name, "ms": 0.0, **attrs})
+
+
+def _finish(record):
+    record["at"] = time.time()
+    _recorder.record(record)
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is not None:
+        record["session"] = ctx.session_id
+        state = ctx.session_state
+        if "_perf_spans" in state:
+            record["run"] = state["_perf_run"]
+            state["_perf_spans"].append(record)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(record, default=str))
+
+
+def begin_run():
+    """Start a new rerun in this session's span log."""
+    if "_perf_spans" not in st.session_state:
+        st.session_state["_perf_spans"] = deque(maxlen=SESSION_SPANS)
+        st.session_state["_perf_run"] = 0
+    st.session_state["_perf_run"] += 1
+    st.session_state["_perf_run_started"] = time.perf_counter()
+
+
+def end_run():
+    """Record the whole script run as one ``rerun`` span."""
+    started = st.session_state.get("_perf_run_started")
+    if started is not None:
+        _finish({"kind": "rerun", "name": "app", "ms": (time.perf_counter() - started) * 1000})
+
+
+def session_spans(current_run_only=False):
+    spans = list(st.session_state.get("_perf_spans", ()))
+    if current_run_only:
+        run = st.session_state.get("_perf_run")
+        spans = [s for s in spans if s.get("run") == run]
+    return spans
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = _recorder.prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@st.cache_resource
+def start_metrics_server():
+    """Serve ``/metrics`` on ``PERF_METRICS_PORT`` once per process; no-op when unset."""
+    if not PERF_METRICS_PORT:
+        return None
+    server = ThreadingHTTPServer(("0.0.0.0", int(PERF_METRICS_PORT)), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="perf-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,117 @@
+"""Concurrent backend fetches with asyncio + httpx.
+
+``fetch_many`` runs independent queries in parallel instead of one after
+another on the script thread. ``warm_session`` uses it from a background
+thread to preload the default views of each tab while the user is still
+looking at another one; results land in the shared response cache and in
+the session's bounded store.
+"""
+import asyncio
+import logging
+import threading
+
+import httpx
+import streamlit as st
+
+import api_client
+import perf
+from response_cache import get_response_cache, normalize_payload
+from services import first_page_payload
+from session_store import get_session_store
+from snapshot import SNAPSHOT_MAX_AGE, get_snapshot_store
+
+MAX_CONCURRENCY = 8
+
+# Default views worth warming for every new session
+DEFAULT_PREFETCH = [
+    ("support-services", first_page_payload()),
+    ("analyze", {"degree": "", "year": 2025}),
+]
+
+logger = logging.getLogger(__name__)
+
+
+async def _fetch(client, endpoint, payload):
+    method, path = api_client.ENDPOINTS[endpoint]
+    connect, read = api_client.TIMEOUTS.get(path, api_client.DEFAULT_TIMEOUT)
+    kwargs = {"params": payload} if method == "GET" else {"json": payload}
+    with perf.span("request", path, method=method, prefetch=True) as span:
+        try:
+            resp = await client.request(method, path, timeout=httpx.Timeout(read, connect=connect), **kwargs)
+        except httpx.HTTPError as exc:
+            span["error"] = type(exc).__name__
+            logger.warning("%s %s failed: %s", method, path, exc)
+            return None
+        span.update(status=resp.status_code, bytes=len(resp.content))
+    if not resp.is_success:
+        logger.warning("%s %s returned HTTP %s", method, path, resp.status_code)
+        return None
+    return api_client.decode_body(resp.headers.get("Content-Type", ""), resp.content, path)
+
+
+async def _gather(calls):
+    limits = httpx.Limits(max_connections=MAX_CONCURRENCY, max_keepalive_connections=MAX_CONCURRENCY)
+    async with httpx.AsyncClient(base_url=api_client.API_BASE, limits=limits,
+                                 headers={"Accept": "application/json"}) as client:
+        return await asyncio.gather(*(_fetch(client, endpoint, payload) for endpoint, payload in calls))
+
+
+def fetch_many(calls, cache=None, snapshot=None):
+    """Run ``(endpoint, payload)`` queries concurrently and return results in order.
+
+    Cached responses and fresh snapshot rows are served without a network
+    call, and successful fetches are written back to the cache. Failed calls
+    yield ``None``.
+    """
+    calls = list(calls)
+    cache = cache if cache is not None else get_response_cache()
+    snapshot = snapshot if snapshot is not None else get_snapshot_store()
+    fresh = snapshot.age is not None and snapshot.age <= SNAPSHOT_MAX_AGE
+    results = [cache.get(endpoint, payload) or (snapshot.lookup(endpoint, payload) if fresh else None)
+               for endpoint, payload in calls]
+    pending = [i for i, data in enumerate(results) if data is None]
+    if pending:
+        fetched = asyncio.run(_gather([calls[i] for i in pending]))
+        for i, data in zip(pending, fetched):
+            if data is not None:
+                cache.put(*calls[i], data)
+            results[i] = data
+    return results
+
+
+class PrefetchJob:
+    """Runs ``fetch_many`` on a daemon thread and keeps the results in the session's store."""
+
+    def __init__(self, calls, cache, snapshot, store):
+        self.calls = list(calls)
+        self.done = threading.Event()
+        self._cache = cache
+        self._snapshot = snapshot
+        self._store = store
+        threading.Thread(target=self._run, name="prefetch", daemon=True).start()
+
+    def get(self, endpoint, payload=None):
+        return self._store.get(self._key(endpoint, payload))
+
+    @staticmethod
+    def _key(endpoint, payload):
+        return f"prefetch:{endpoint}:{normalize_payload(payload)}"
+
+    def _run(self):
+        try:
+            for (endpoint, payload), data in zip(self.calls, fetch_many(self.calls, cache=self._cache, snapshot=self._snapshot)):
+                if data is not None:
+                    self._store.put(self._key(endpoint, payload), data)
+        except Exception:
+            logger.exception("Prefetch failed")
+        finally:
+            self.done.set()
+
+
+def warm_session(calls=DEFAULT_PREFETCH):
+    """Start the prefetch job for this session once and return it."""
+    job = st.session_state.get("prefetch")
+    if job is None:
+        job = PrefetchJob(calls, get_response_cache(), get_snapshot_store(), get_session_store())
+        st.session_state["prefetch"] = job
+    return job
@@ -0,0 +1,105 @@
+"""Process-wide TTL cache for backend query responses.
+
+Entries are keyed on a normalized form of the request payload, so the same
+degree/year or question typed with different spacing or casing shares one
+entry. The cache is created once per server process and shared by every
+Streamlit session.
+"""
+import json
+import threading
+from collections import Counter
+
+import streamlit as st
+from cachetools import TTLCache
+
+# endpoint -> (ttl seconds, max entries)
+CACHE_POLICIES = {
+    "analyze": (600, 256),
+    "insights": (1800, 512),
+    "support-services": (300, 16),
+    "roi": (600, 256),
+    "compare": (600, 256),
+}
+
+_MISSING = object()
+
+
+def normalize_payload(payload):
+    """Return a stable, hashable cache key for a request payload."""
+    def _norm(value):
+        if isinstance(value, str):
+            return " ".join(value.split()).casefold()
+        if isinstance(value, dict):
+            return {k: _norm(v) for k, v in value.items() if v is not None}
+        if isinstance(value, (list, tuple)):
+            return [_norm(v) for v in value]
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+
+    return json.dumps(_norm(payload or {}), sort_keys=True, separators=(",", ":"))
+
+
+class ResponseCache:
+    def __init__(self, policies=None):
+        self.policies = dict(policies or CACHE_POLICIES)
+        self._caches = {
+            endpoint: TTLCache(maxsize=size, ttl=ttl)
+            for endpoint, (ttl, size) in self.policies.items()
+        }
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def get(self, endpoint, payload, default=None):
+        cache = self._caches.get(endpoint)
+        if cache is None:
+            return default
+        key = normalize_payload(payload)
+        with self._lock:
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses[endpoint] += 1
+                return default
+            self.hits[endpoint] += 1
+            return value
+
+    def peek(self, endpoint, payload):
+        """Like ``get`` but without touching the hit/miss counters."""
+        cache = self._caches.get(endpoint)
+        if cache is None:
+            return None
+        with self._lock:
+            return cache.get(normalize_payload(payload))
+
+    def put(self, endpoint, payload, value):
+        cache = self._caches.get(endpoint)
+        if cache is None:
+            return
+        key = normalize_payload(payload)
+        with self._lock:
+            cache[key] = value
+
+    def clear(self):
+        with self._lock:
+            for cache in self._caches.values():
+                cache.clear()
+
+    def stats(self):
+        """Per-endpoint hit/miss counters and current occupancy."""
+        with self._lock:
+            return {
+                endpoint: {
+                    "hits": self.hits[endpoint],
+                    "misses": self.misses[endpoint],
+                    "entries": cache.currsize,
+                    "max_entries": int(cache.maxsize),
+                    "ttl_s": cache.ttl,
+                }
+                for endpoint, cache in self._caches.items()
+            }
+
+
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache()
@@ -0,0 +1,141 @@
+"""Client-side ROI model for instant what-if sweeps.
+
+The salary and employment inputs for an institution and degree come from one
+``/roi`` response; everything else is computed locally with NumPy, broadcast
+over whole grids of tuition, salary growth and horizon.
+
+Model: in year ``t`` after graduation a graduate expects
+``salary * (1 + growth) ** (t - 1) * employment_rate``. Cumulative earnings
+after ``t`` years are therefore a geometric series, which gives closed forms
+for both ROI and the break-even point.
+
+NumPy and pandas are imported inside the functions, so they load when a
+what-if sweep first runs rather than at app start-up.
+"""
+import re
+from dataclasses import dataclass
+
+# Fallback spread around the median when the backend gives no salary range
+SALARY_SPREAD = 0.25
+# Employment-rate swing (percentage points) for the pessimistic/optimistic bands
+EMPLOYMENT_SWING = 10.0
+
+
+@dataclass(frozen=True)
+class RoiInputs:
+    median_salary: float
+    employment_rate: float  # percent
+    salary_low: float
+    salary_high: float
+
+    @classmethod
+    def from_response(cls, data):
+        """Build inputs from a ``/roi`` response, or return ``None`` if it has no salary."""
+        salary = float(data.get("median_salary") or 0)
+        if salary <= 0:
+            return None
+        bounds = [float(n.replace(",", ""))
+                  for n in re.findall(r"\d[\d,]*(?:\.\d+)?", str(data.get("salary_range", "")))]
+        low, high = (min(bounds), max(bounds)) if len(bounds) >= 2 else (None, None)
+        # "5-12 LPA" or "₹5.2L - ₹12L" parse to bounds in other units; only trust a range around the median
+        if low is None or not low <= salary <= high:
+            low, high = salary * (1 - SALARY_SPREAD), salary * (1 + SALARY_SPREAD)
+        return cls(salary, float(data.get("employment_rate") or 0), low, high)
+
+    def bands(self):
+        """``{band: (salary, employment_rate)}`` for pessimistic, expected and optimistic cases."""
+        return {
+            "Pessimistic": (self.salary_low, max(self.employment_rate - EMPLOYMENT_SWING, 0.0)),
+            "Expected": (self.median_salary, self.employment_rate),
+            "Optimistic": (self.salary_high, min(self.employment_rate + EMPLOYMENT_SWING, 100.0)),
+        }
+
+
+def cumulative_earnings(years, salary, employment_rate, growth):
+    """Expected earnings over the first ``years`` years after graduation."""
+    import numpy as np
+
+    years, salary, rate, growth = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (years, salary, employment_rate, growth)))
+    yearly = salary * rate / 100
+    with np.errstate(divide="ignore", invalid="ignore"):
+        geometric = yearly * ((1 + growth) ** years - 1) / growth
+    return np.where(np.isclose(growth, 0), yearly * years, geometric)
+
+
+def roi_percent(tuition, years, salary, employment_rate, growth):
+    """Return on the tuition after ``years`` years of work, in percent (NaN for zero tuition)."""
+    import numpy as np
+
+    tuition = np.asarray(tuition, dtype=float)
+    earnings = cumulative_earnings(years, salary, employment_rate, growth)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(tuition > 0, (earnings - tuition) / tuition * 100, np.nan)
+
+
+def break_even_years(tuition, salary, employment_rate, growth):
+    """Years after graduation until cumulative earnings cover the tuition (0 if free, ``inf`` if never)."""
+    import numpy as np
+
+    tuition, salary, rate, growth = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (tuition, salary, employment_rate, growth)))
+    yearly = salary * rate / 100
+    with np.errstate(divide="ignore", invalid="ignore"):
+        flat = tuition / yearly
+        grown = np.log1p(tuition * growth / yearly) / np.log1p(growth)
+    years = np.where(np.isclose(growth, 0), flat, grown)
+    return np.where(tuition <= 0, 0.0, np.where(yearly > 0, years, np.inf))
+
+
+def roi_summary(inputs, tuition, growth=0.0):
+    """The ``/roi`` headline numbers for ``tuition``, computed locally from ``inputs``.
+
+    Uses the backend's flat-salary model by default, so a resubmit with a
+    different tuition matches what ``/roi`` would have answered.
+    """
+    import numpy as np
+
+    salary, rate = inputs.median_salary, inputs.employment_rate
+    roi_5, roi_10 = np.nan_to_num(roi_percent(tuition, [5, 10], salary, rate, growth))
+    return {
+        "median_salary": salary,
+        "employment_rate": rate,
+        "estimated_years_to_break_even": float(break_even_years(tuition, salary, rate, growth)),
+        "roi_5_year": float(roi_5),
+        "roi_10_year": float(roi_10),
+    }
+
+
+def roi_curves(inputs, tuition, horizon, growth):
+    """Long-format DataFrame of ROI per year after graduation for each risk band."""
+    import numpy as np
+    import pandas as pd
+
+    years = np.arange(1, horizon + 1)
+    frames = [
+        pd.DataFrame({
+            "year": years,
+            "band": band,
+            "roi_percent": roi_percent(tuition, years, salary, rate, growth),
+        })
+        for band, (salary, rate) in inputs.bands().items()
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def break_even_grid(inputs, tuitions, growths):
+    """Expected break-even years for every (growth, tuition) pair; rows follow ``growths``."""
+    import numpy as np
+
+    tuition_grid, growth_grid = np.meshgrid(np.asarray(tuitions, dtype=float), np.asarray(growths, dtype=float))
+    return break_even_years(tuition_grid, inputs.median_salary, inputs.employment_rate, growth_grid)
+
+
+def break_even_sweep(inputs, tuition, points=40, max_growth=0.15):
+    """Tuition axis, growth axis and break-even grid for a heatmap around ``tuition``."""
+    import numpy as np
+
+    base = tuition if tuition > 0 else inputs.median_salary
+    tuitions = np.linspace(base * 0.25, base * 2.0, points)
+    growths = np.linspace(0.0, max_growth, 31)
+    return tuitions, growths, break_even_grid(inputs, tuitions, growths)
@@ -0,0 +1,212 @@
+"""Benchmark the UI hot paths of app.py against the local stub backend.
+
+Starts ``stub_backend`` in-process with configurable response sizes and
+latencies, then drives app.py with Streamlit's AppTest. For every tab action
+it records rerun latency, backend requests and response bytes per rerun, and
+peak Python memory, both with a cold and a warm response cache:
+
+    python scripts/bench.py --institutions 500 --latency-ms 50 --output bench.json
+
+The report is JSON and tagged with the git revision so two versions can be
+diffed directly.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from stub_backend import parse_path_latency, start_in_thread  # noqa: E402
+
+# Health probes run on their own schedule and are not part of any rerun
+IGNORED_PATHS = {"/"}
+
+
+def click(at, label):
+    at.button[[b.label for b in at.button].index(label)].click().run()
+
+
+def _dashboard(at):
+    at.text_input(key="degree_dashboard").input("Computer Science")
+    return lambda: click(at, "🔍 Analyze Outcomes")
+
+
+def _insights(stream):
+    def prepare(at):
+        at.toggle(key="stream_insights").set_value(stream).run()
+        at.text_area[0].input("What are the salary trends for Engineering graduates through 2030?")
+        return lambda: click(at, "🚀 Generate Insights")
+    return prepare
+
+
+def _support(at):
+    return lambda: click(at, "📊 Load Support Services Data")
+
+
+def _roi(at):
+    at.text_input(key="roi_institution").input("VIT University")
+    at.text_input(key="roi_degree").input("Computer Science")
+    return lambda: click(at, "🧮 Calculate ROI")
+
+
+def _compare(at):
+    at.text_input(key="inst_a").input("IIT Delhi")
+    at.text_input(key="inst_b").input("VIT University")
+    return lambda: click(at, "🔄 Compare Institutions")
+
+
+def _compare_multi(count):
+    def prepare(at):
+        at.radio(key="compare_mode").set_value("Multiple institutions").run()
+        names = [f"Institute {i:04d}" for i in range(count)]
+        at.text_area(key="inst_multi").input("\n".join(names))
+        return lambda: click(at, "🔄 Rank Institutions")
+    return prepare
+
+
+def scenarios(args):
+    return {
+        "dashboard": _dashboard,
+        "insights_stream": _insights(True),
+        "insights_blocking": _insights(False),
+        "support_services": _support,
+        "roi": _roi,
+        "compare": _compare,
+        f"compare_{args.compare_n}": _compare_multi(args.compare_n),
+    }
+
+
+def new_session(app_path):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app_path, default_timeout=120).run()
+    if at.exception:
+        raise RuntimeError(f"app.py raised on first run: {at.exception}")
+    # Let the background prefetch settle so it doesn't leak into the measurement
+    job = at.session_state["prefetch"] if "prefetch" in at.session_state else None
+    if job is not None:
+        job.done.wait(30)
+        # One more rerun lets the tabs pick up the prefetched data
+        at.run()
+    return at
+
+
+def run_sample(app_path, prepare, server, cold, trace_memory):
+    from response_cache import get_response_cache
+
+    at = new_session(app_path)
+    act = prepare(at)
+    if cold:
+        get_response_cache().clear()
+    server.reset_stats()
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    act()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+
+    if at.exception:
+        raise RuntimeError(f"app.py raised: {at.exception}")
+    stats = server.stats()
+    return {
+        "latency_ms": elapsed * 1000,
+        "requests": sum(n for p, n in stats["requests"].items() if p not in IGNORED_PATHS),
+        "bytes": sum(n for p, n in stats["bytes"].items() if p not in IGNORED_PATHS),
+        "peak_mem_mb": peak / 2**20 if peak is not None else None,
+    }
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(samples, memory):
+    latencies = [s["latency_ms"] for s in samples]
+    return {
+        "latency_ms": {
+            "median": statistics.median(latencies),
+            "p95": percentile(latencies, 95),
+            "min": min(latencies),
+            "max": max(latencies),
+        },
+        "requests_per_rerun": statistics.mean(s["requests"] for s in samples),
+        "bytes_per_rerun": statistics.mean(s["bytes"] for s in samples),
+        "peak_mem_mb": memory["peak_mem_mb"],
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app.py against a local stub backend.")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per scenario and cache state")
+    parser.add_argument("--institutions", type=int, default=100, help="rows in tabular responses")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="stub delay for every response")
+    parser.add_argument("--path-latency", action="append", metavar="PATH=MS",
+                        help="per-path stub delay, e.g. /insights=800 (repeatable)")
+    parser.add_argument("--answer-words", type=int, default=200)
+    parser.add_argument("--token-delay-ms", type=float, default=0.0)
+    parser.add_argument("--compare-n", type=int, default=20, help="institutions in the N-way comparison")
+    parser.add_argument("--only", action="append", help="run only these scenarios (repeatable)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    server = start_in_thread(
+        institutions=args.institutions, latency_ms=args.latency_ms,
+        path_latency_ms=parse_path_latency(args.path_latency),
+        token_delay_ms=args.token_delay_ms, answer_words=args.answer_words,
+    )
+    os.environ["API_BASE"] = f"http://127.0.0.1:{server.server_port}"
+    # Measure the backend path, not a snapshot lying around in the checkout
+    os.environ.setdefault("SNAPSHOT_PATH", "")
+    app_path = os.path.join(ROOT, "app.py")
+
+    results = {}
+    for name, prepare in scenarios(args).items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = {}
+        for state, cold in (("cold", True), ("warm", False)):
+            samples = [run_sample(app_path, prepare, server, cold, trace_memory=False)
+                       for _ in range(args.repeat)]
+            memory = run_sample(app_path, prepare, server, cold, trace_memory=True)
+            results[name][state] = summarize(samples, memory)
+            latency = results[name][state]["latency_ms"]
+            print(f"{name:<20} {state:<5} median {latency['median']:8.1f} ms  p95 {latency['p95']:8.1f} ms",
+                  file=sys.stderr)
+
+    report = {
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "scenarios": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
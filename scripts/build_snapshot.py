@@ -0,0 +1,39 @@
+"""Build the offline snapshot bundle the UI serves common queries from.
+
+Fetches every dashboard (degree x year), popular comparison and
+support-services page from the backend at ``API_BASE`` and writes them to one
+Arrow IPC file, replacing the old one atomically. Run it from cron or the
+Heroku scheduler, or set ``SNAPSHOT_REFRESH_INTERVAL`` on the web dyno instead.
+
+    API_BASE=https://career-api.example.com python scripts/build_snapshot.py
+    python scripts/build_snapshot.py --output /data/career_snapshot.arrow
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot import SNAPSHOT_PATH, SnapshotStore, build_snapshot  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=SNAPSHOT_PATH, help="snapshot file to write")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent backend requests")
+    args = parser.parse_args()
+    if not args.output:
+        parser.error("SNAPSHOT_PATH is empty (snapshot disabled); pass --output")
+
+    started = time.perf_counter()
+    rows = build_snapshot(args.output, workers=args.workers)
+    size_kb = os.path.getsize(args.output) / 1024
+    print(f"Wrote {rows} responses ({size_kb:.0f} KiB) to {args.output} "
+          f"in {time.perf_counter() - started:.1f}s")
+    if not len(SnapshotStore(args.output)):
+        sys.exit("Snapshot is empty; is the backend reachable?")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""Load-test a real ``streamlit run app.py`` server with many concurrent sessions.
+
+Starts the stub backend in this process and app.py as a Streamlit server
+subprocess, the same way the Procfile runs it, then connects N websocket
+clients that speak Streamlit's browser protocol. Every virtual user works
+through the four tabs (dashboard, insights, support services + ROI,
+comparison) with its own degree/year/institution mix, so the shared caches are
+not hit 100% of the time:
+
+    python scripts/loadtest.py --sessions 25 --journeys 3 --latency-ms 80 \\
+        --path-latency /insights=1500 --output load.json
+
+A rerun is timed from sending the widget states to the server's
+``script_finished`` message, so queueing inside the server is included. The
+report gives throughput, p50/p95/p99 rerun latency overall and per action,
+the slowdown against a solo session, websocket bytes per rerun, and the
+server's thread count and RSS growth per session. Like ``bench.py`` it is JSON
+tagged with the git revision.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.NumberInput_pb2 import NumberInput
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from bench import git_revision, percentile  # noqa: E402
+from measure_startup import free_port, rss_mb  # noqa: E402
+from stub_backend import KNOWN_INSTITUTIONS, parse_path_latency, start_in_thread  # noqa: E402
+
+DEGREES = ["Computer Science", "Engineering", "Data Science", "Information Technology", "Economics"]
+QUESTIONS = [
+    "What are the salary trends for {degree} graduates through {year}?",
+    "Which institutions place the most {degree} graduates?",
+    "How does employment for {degree} look in {year}?",
+]
+
+
+class SessionClient:
+    """One browser tab: keeps the widget ids it has seen and the values it has set."""
+
+    def __init__(self, url):
+        self.url = url
+        self.ws = None
+        self.page_hash = ""
+        self.widgets = {}  # widget id -> (element type, element proto)
+        self.values = {}  # widget id -> WidgetState sent on every rerun
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, max_message_size=256 * 2**20)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    def widget_id(self, name):
+        """Find a widget by its ``key`` or, for unkeyed widgets, its label."""
+        for widget_id, (kind, element) in self.widgets.items():
+            if widget_id.endswith(f"-{name}") or getattr(element, "label", None) == name:
+                return widget_id
+        raise LookupError(f"no widget {name!r} on the page")
+
+    def set(self, name, value):
+        widget_id = self.widget_id(name)
+        kind, element = self.widgets[widget_id]
+        state = WidgetState(id=widget_id)
+        if kind in ("text_input", "text_area"):
+            state.string_value = value
+        elif kind == "number_input" and element.data_type == NumberInput.INT:
+            state.int_value = int(value)
+        elif kind == "number_input":
+            state.double_value = float(value)
+        elif kind == "checkbox":
+            state.bool_value = bool(value)
+        elif kind == "radio":
+            state.int_value = list(element.options).index(value)
+        else:
+            raise TypeError(f"don't know how to set a {kind}")
+        self.values[widget_id] = state
+
+    async def click(self, label):
+        return await self.rerun(trigger=self.widget_id(label))
+
+    async def rerun(self, trigger=None):
+        """Rerun the script; returns ``(ms, bytes_received, ok)``."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = self.page_hash
+        msg.rerun_script.widget_states.widgets.extend(self.values.values())
+        if trigger is not None:
+            msg.rerun_script.widget_states.widgets.append(WidgetState(id=trigger, trigger_value=True))
+        started = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+
+        received, ok = 0, True
+        while True:
+            raw = await self.ws.read_message()
+            if raw is None:
+                raise ConnectionError("server closed the websocket")
+            received += len(raw)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "new_session":
+                self.page_hash = fwd.new_session.page_script_hash
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    ok = False
+                elif element_type and hasattr(getattr(element, element_type), "id"):
+                    widget = getattr(element, element_type)
+                    if widget.id:
+                        self.widgets[widget.id] = (element_type, widget)
+            elif kind == "script_finished":
+                ok = ok and fwd.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY
+                return (time.perf_counter() - started) * 1000, received, ok
+
+
+def journey(client, user, round_no):
+    """The tab actions of one pass through the app, as ``(name, coroutine function)`` pairs."""
+    degree = DEGREES[(user + round_no) % len(DEGREES)]
+    year = 2025 + (user + round_no) % 6
+    inst_a = KNOWN_INSTITUTIONS[user % len(KNOWN_INSTITUTIONS)]
+    inst_b = KNOWN_INSTITUTIONS[(user + round_no + 1) % len(KNOWN_INSTITUTIONS)]
+    if inst_b == inst_a:
+        inst_b = KNOWN_INSTITUTIONS[(user + 1) % len(KNOWN_INSTITUTIONS)]
+    question = QUESTIONS[(user + round_no) % len(QUESTIONS)].format(degree=degree, year=year)
+
+    async def dashboard():
+        client.set("degree_dashboard", degree)
+        client.set("year_dashboard", year)
+        return await client.click("🔍 Analyze Outcomes")
+
+    async def insights():
+        client.set("💬 Your Question:", question)
+        return await client.click("🚀 Generate Insights")
+
+    async def support():
+        return await client.click("📊 Load Support Services Data")
+
+    async def roi():
+        client.set("roi_institution", inst_a)
+        client.set("roi_degree", degree)
+        return await client.click("🧮 Calculate ROI")
+
+    async def compare():
+        client.set("inst_a", inst_a)
+        client.set("inst_b", inst_b)
+        client.set("year_compare", year)
+        return await client.click("🔄 Compare Institutions")
+
+    return [("dashboard", dashboard), ("insights", insights), ("support_services", support),
+            ("roi", roi), ("compare", compare)]
+
+
+async def virtual_user(url, user, journeys, think_s, start_delay, stream, samples, errors, clients):
+    await asyncio.sleep(start_delay)
+    client = SessionClient(url)
+    clients.append(client)  # kept open until the end so the server holds the session
+    try:
+        await client.connect()
+        samples.append(("first_run", *await client.rerun()))
+        client.set("stream_insights", stream)
+        await client.rerun()
+        for round_no in range(journeys):
+            for name, action in journey(client, user, round_no):
+                samples.append((name, *await action()))
+                await asyncio.sleep(think_s)
+    except Exception as exc:  # a failing user is reported, not fatal to the run
+        errors.append(f"user {user}: {type(exc).__name__}: {exc}")
+
+
+def server_threads(pid):
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("Threads:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class ResourceSampler(threading.Thread):
+    """Samples the server's thread count and RSS until stopped."""
+
+    def __init__(self, pid, interval=0.2):
+        super().__init__(name="loadtest-sampler", daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.threads = []
+        self.rss = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            threads, rss = server_threads(self.pid), rss_mb(self.pid)
+            if threads is not None:
+                self.threads.append(threads)
+            if rss is not None:
+                self.rss.append(rss)
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def start_app(api_base, timeout=60.0):
+    """Run app.py under ``streamlit run`` and return ``(process, port)`` once it is healthy."""
+    port = free_port()
+    env = {**os.environ, "API_BASE": api_base}
+    # Load the backend path, not a snapshot lying around in the checkout
+    env.setdefault("SNAPSHOT_PATH", "")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py",
+         "--server.headless", "true", "--server.port", str(port),
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as resp:
+                if resp.status == 200:
+                    return proc, port
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError(f"Streamlit server did not become healthy within {timeout:.0f}s")
+
+
+def latency_summary(values):
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": statistics.mean(values),
+        "max": max(values),
+    }
+
+
+async def solo_baseline(url, stream):
+    """Per-action latency of one user alone; also warms imports and shared caches."""
+    samples, errors, clients = [], [], []
+    await virtual_user(url, -1, 1, 0.0, 0.0, stream, samples, errors, clients)
+    for client in clients:
+        client.close()
+    if errors:
+        raise RuntimeError(f"solo session failed: {errors[0]}")
+    return {name: ms for name, ms, _, _ in samples}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test app.py with concurrent sessions against the stub backend.")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--journeys", type=int, default=2, help="passes through all tabs per user")
+    parser.add_argument("--ramp-up", type=float, default=2.0, help="seconds over which users start")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="pause between a user's actions")
+    parser.add_argument("--institutions", type=int, default=100, help="rows in tabular responses")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="stub delay for every response")
+    parser.add_argument("--path-latency", action="append", metavar="PATH=MS",
+                        help="per-path stub delay, e.g. /insights=1500 (repeatable)")
+    parser.add_argument("--no-stream", dest="stream", action="store_false",
+                        help="use blocking /insights instead of the event stream")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    backend = start_in_thread(
+        institutions=args.institutions, latency_ms=args.latency_ms,
+        path_latency_ms=parse_path_latency(args.path_latency), token_delay_ms=0.0,
+    )
+    proc, port = start_app(f"http://127.0.0.1:{backend.server_port}")
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    try:
+        report = asyncio.run(measure(url, proc.pid, backend, args))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+        backend.shutdown()
+
+    latency = report["rerun_latency_ms"]
+    print(f"{args.sessions} sessions · {latency['count']} reruns in {report['wall_s']:.1f}s "
+          f"({report['throughput']['reruns_per_s']:.1f}/s) · p50 {latency['p50']:.0f} ms "
+          f"p95 {latency['p95']:.0f} ms p99 {latency['p99']:.0f} ms · "
+          f"peak {report['threads']['peak']} server threads · "
+          f"{report['memory_mb']['growth_per_session'] or 0:.1f} MiB/session", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+
+async def measure(url, pid, backend, args):
+    solo = await solo_baseline(url, args.stream)
+    await asyncio.sleep(1.0)
+    base_threads, base_rss = server_threads(pid), rss_mb(pid)
+    backend.reset_stats()
+
+    sampler = ResourceSampler(pid)
+    sampler.start()
+    samples, errors, clients = defaultdict(list), [], []
+    step = args.ramp_up / max(args.sessions - 1, 1)
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        virtual_user(url, i, args.journeys, args.think_ms / 1000, i * step, args.stream,
+                     samples[i], errors, clients)
+        for i in range(args.sessions)
+    ))
+    wall_s = time.perf_counter() - started
+    # Every session is still connected here, so this RSS includes their state
+    end_threads, end_rss = server_threads(pid), rss_mb(pid)
+    sampler.stop()
+    for client in clients:
+        client.close()
+
+    by_action, failures, sent = defaultdict(list), defaultdict(int), defaultdict(list)
+    for user_samples in samples.values():
+        for name, ms, received, ok in user_samples:
+            by_action[name].append(ms)
+            sent[name].append(received)
+            failures[name] += not ok
+    reruns = [ms for name, values in by_action.items() if name != "first_run" for ms in values]
+    if not reruns:
+        raise RuntimeError(f"No reruns completed: {errors}")
+    stats = backend.stats()
+    peak_threads = max(sampler.threads, default=end_threads)
+
+    return {
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "wall_s": wall_s,
+        "throughput": {
+            "reruns_per_s": len(reruns) / wall_s,
+            "journeys_per_min": len(reruns) / len(journey(None, 0, 0)) * 60 / wall_s,
+            "backend_requests": sum(n for p, n in stats["requests"].items() if p != "/"),
+        },
+        "rerun_latency_ms": latency_summary(reruns),
+        "actions": {
+            name: {
+                **latency_summary(values),
+                "solo_ms": solo.get(name),
+                "slowdown_p50": percentile(values, 50) / solo[name] if solo.get(name) else None,
+                "ws_bytes_mean": statistics.mean(sent[name]),
+                "failures": failures[name],
+            }
+            for name, values in sorted(by_action.items())
+        },
+        "threads": {
+            "baseline": base_threads,
+            "peak": peak_threads,
+            "end": end_threads,
+            "per_session": (end_threads - base_threads) / args.sessions if end_threads and base_threads else None,
+        },
+        "memory_mb": {
+            "baseline_rss": base_rss,
+            "peak_rss": max(sampler.rss, default=None),
+            "end_rss": end_rss,
+            "growth_per_session": (end_rss - base_rss) / args.sessions if end_rss and base_rss else None,
+        },
+        "errors": errors,
+    }
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Measure frontend cold-start latency and per-worker memory.
+
+Every sample runs in a fresh interpreter so nothing is warm:
+
+* ``server``: time from ``streamlit run app.py`` until ``/_stcore/health``
+  answers, and the server process RSS at that point.
+* ``first_run``: wall time of the first full script run of app.py (through
+  Streamlit's AppTest, against the local stub backend), the peak RSS of that
+  process, and which heavy modules the run pulled in.
+
+    python scripts/measure_startup.py --runs 5 --output startup.json
+
+The JSON report includes the git revision, so reports from different
+releases can be diffed directly.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from bench import git_revision  # noqa: E402
+
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "plotly", "httpx", "torch", "transformers", "faiss", "gradio"]
+
+FIRST_RUN_CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {scripts!r})
+from stub_backend import start_in_thread
+server = start_in_thread()
+import os
+os.environ["API_BASE"] = "http://127.0.0.1:%d" % server.server_port
+# Measure the backend path, not a snapshot lying around in the checkout
+os.environ.setdefault("SNAPSHOT_PATH", "")
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=60).run()
+elapsed = time.perf_counter() - started
+scale = 1 if sys.platform == "darwin" else 1024
+print(json.dumps({{
+    "first_run_s": elapsed,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20,
+    "exception": bool(at.exception),
+    "modules": [m for m in {modules!r} if m in sys.modules],
+}}))
+"""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid):
+    """Current resident set size of ``pid`` in MiB (Linux), or ``None``."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def measure_server(timeout=60.0):
+    port = free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py",
+         "--server.headless", "true", "--server.port", str(port),
+         "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env={"SNAPSHOT_PATH": "", **os.environ}, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as resp:
+                    if resp.status == 200:
+                        return {"server_ready_s": time.perf_counter() - started, "server_rss_mb": rss_mb(proc.pid)}
+            except OSError:
+                time.sleep(0.05)
+        raise RuntimeError(f"Streamlit server did not become healthy within {timeout:.0f}s")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+def measure_first_run():
+    code = FIRST_RUN_CHILD.format(scripts=os.path.join(ROOT, "scripts"), app=os.path.join(ROOT, "app.py"),
+                                  modules=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure frontend cold start and memory.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--skip-server", action="store_true", help="only measure the first script run")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    samples = []
+    for i in range(args.runs):
+        sample = {} if args.skip_server else measure_server()
+        sample.update(measure_first_run())
+        samples.append(sample)
+        print(f"run {i + 1}/{args.runs}: " + ", ".join(
+            f"{k}={v:.3f}" for k, v in sample.items() if isinstance(v, float)), file=sys.stderr)
+
+    numeric = [k for k, v in samples[0].items() if isinstance(v, float)]
+    report = {
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "median": {k: statistics.median(s[k] for s in samples if s[k] is not None) for k in numeric},
+        "samples": samples,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""Local stand-in for the FastAPI backend.
+
+Serves synthetic responses for every endpoint the UI calls, including the
+server-sent events variant of ``/insights``, so the frontend can be run and
+exercised without the real backend:
+
+    python scripts/stub_backend.py --port 8000
+    API_BASE=http://127.0.0.1:8000 streamlit run app.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+KNOWN_INSTITUTIONS = [
+    "IIT Delhi", "IIT Bombay", "IIT Madras", "BITS Pilani", "VIT University",
+    "SRM University", "Amrita University", "KL University", "NIT Trichy",
+    "Manipal University", "IIIT Hyderabad", "Anna University",
+]
+DEGREES = [
+    "Computer Science", "Information Technology", "Data Science", "Electronics and Communication",
+    "Mechanical Engineering", "Civil Engineering", "Business Administration", "Economics",
+]
+SERVICES = [
+    "Career Counseling", "Resume Workshops", "Mock Interviews", "Campus Placements",
+    "Alumni Mentoring", "Internship Portal", "Startup Incubator", "Soft Skills Training",
+    "Higher Studies Guidance", "Industry Projects",
+]
+
+
+def institution_names(count):
+    names = KNOWN_INSTITUTIONS[:count]
+    names += [f"Institute {i:04d}" for i in range(len(names), count)]
+    return names
+
+
+def institution_stats(name, year=2025):
+    rng = random.Random(f"{name}:{year}")
+    return {
+        "institution": name,
+        "avg_employment_rate": round(rng.uniform(60, 98), 1),
+        "avg_salary": rng.randrange(350_000, 2_500_000, 1000),
+        "employment_std": round(rng.uniform(1, 8), 2),
+        "salary_std": rng.randrange(20_000, 200_000, 1000),
+    }
+
+
+def support_row(name):
+    rng = random.Random(name)
+    services = rng.sample(SERVICES, rng.randint(3, len(SERVICES)))
+    return {
+        "institution": name,
+        "support_index": round(rng.uniform(40, 95), 1),
+        "career_services_rating": round(rng.uniform(2.5, 5), 1),
+        "alumni_network_strength": round(rng.uniform(1, 10), 1),
+        "total_services": len(services),
+        "services": services,
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "CareerStub/1.0"
+
+    def log_message(self, *args):
+        pass
+
+    # -- routing -----------------------------------------------------------------
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path == "/":
+            self._json({"status": "ok"})
+        elif url.path == "/insights":
+            self._json(self._insights(params.get("q", "")))
+        elif url.path == "/insights/stream" and self.server.options.stream:
+            self._stream_insights(params.get("q", ""))
+        elif url.path == "/support-services":
+            self._table(self._support_services(params), "institutions")
+        elif url.path == "/catalog" and self.server.options.catalog:
+            self._json(self._catalog())
+        else:
+            self._json({"detail": "Not Found"}, status=404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        path = urlparse(self.path).path
+        if path == "/analyze":
+            self._table(self._analyze(body), "top_institutions")
+        elif path == "/roi":
+            self._json(self._roi(body))
+        elif path == "/compare":
+            self._table(self._compare(body), "comparison")
+        else:
+            self._json({"detail": "Not Found"}, status=404)
+
+    # -- responses ---------------------------------------------------------------
+
+    def _support_services(self, params):
+        names = institution_names(self.server.options.institutions)
+        if params.get("q"):
+            names = [n for n in names if params["q"].lower() in n.lower()]
+        if "limit" not in params:
+            return {"institutions": [support_row(n) for n in names]}
+        start, limit = int(params.get("cursor") or 0), int(params["limit"])
+        end = start + limit
+        return {
+            "institutions": [support_row(n) for n in names[start:end]],
+            "next_cursor": str(end) if end < len(names) else None,
+            "total": len(names),
+        }
+
+    def _catalog(self):
+        return {
+            "institutions": institution_names(self.server.options.institutions),
+            "degrees": DEGREES,
+        }
+
+    def _analyze(self, body):
+        year = body.get("year") or 2025
+        rows = [institution_stats(n, year) for n in institution_names(self.server.options.institutions)]
+        rows.sort(key=lambda r: r["avg_employment_rate"], reverse=True)
+        return {
+            "summary": f"Outcomes for {body.get('degree') or 'all degrees'} graduates in {year}.",
+            "data_quality": "Synthetic data from stub backend",
+            "trend": "improving",
+            "median_salary": 850_000,
+            "top_institutions": rows,
+        }
+
+    def _insights(self, question):
+        return {
+            "summary": self._answer(question),
+            "confidence": "High",
+            "data_freshness": "Stub data",
+            "llm_enabled": False,
+            "sources": ["stub://employment.csv", "stub://salaries.csv"],
+        }
+
+    def _answer(self, question):
+        words = max(20, self.server.options.answer_words)
+        filler = " ".join("Graduates" if i % 12 == 0 else "outcomes" for i in range(words))
+        return f"Answer to: {question}. {filler}."
+
+    def _roi(self, body):
+        stats = institution_stats(body.get("institution") or "Unknown")
+        tuition = float(body.get("tuition_total") or 0)
+        yearly = stats["avg_salary"] * stats["avg_employment_rate"] / 100
+        return {
+            "median_salary": stats["avg_salary"],
+            "employment_rate": stats["avg_employment_rate"],
+            "estimated_years_to_break_even": round(tuition / yearly, 1) if yearly else 0,
+            "risk_level": "Low" if stats["avg_employment_rate"] > 85 else "Medium",
+            "roi_5_year": round((5 * yearly - tuition) / tuition * 100, 1) if tuition else 0,
+            "roi_10_year": round((10 * yearly - tuition) / tuition * 100, 1) if tuition else 0,
+            "salary_range": f"₹{int(stats['avg_salary'] * 0.7):,} - ₹{int(stats['avg_salary'] * 1.4):,}",
+            "data_quality": "Synthetic data from stub backend",
+        }
+
+    def _compare(self, body):
+        year = body.get("year") or 2025
+        names = body.get("institutions") or [body.get("institution_a"), body.get("institution_b")]
+        rows = [institution_stats(n, year) for n in names if n]
+        return {
+            "summary": f"Compared {len(rows)} institutions for {year}.",
+            "data_quality": "Synthetic data from stub backend",
+            "comparison": rows,
+        }
+
+    # -- transport ---------------------------------------------------------------
+
+    def _delay(self):
+        path = urlparse(self.path).path
+        latency_ms = self.server.options.path_latency_ms.get(path, self.server.options.latency_ms)
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+
+    def _record(self, nbytes, request=False):
+        self.server.record(urlparse(self.path).path, nbytes, request)
+
+    def _json(self, payload, status=200):
+        self._delay()
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        # Count before writing so the client can never observe a response that isn't counted yet
+        self._record(len(body), request=True)
+        self.wfile.write(body)
+
+    def _table(self, payload, key):
+        """Answer in Arrow IPC when the client asks for it and pyarrow is installed."""
+        if "application/vnd.apache.arrow.stream" not in self.headers.get("Accept", ""):
+            return self._json(payload)
+        try:
+            import pyarrow as pa
+        except ImportError:
+            return self._json(payload)
+
+        fields = {k: v for k, v in payload.items() if k != key}
+        table = pa.Table.from_pylist(payload[key]).replace_schema_metadata(
+            {"table": key, "fields": json.dumps(fields)})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        body = sink.getvalue().to_pybytes()
+
+        self._delay()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/vnd.apache.arrow.stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        # Count before writing so the client can never observe a response that isn't counted yet
+        self._record(len(body), request=True)
+        self.wfile.write(body)
+
+    def _stream_insights(self, question):
+        self._delay()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._record(0, request=True)
+
+        full = self._insights(question)
+        self._event("meta", {k: full[k] for k in ("confidence", "data_freshness", "llm_enabled")})
+        for word in full["summary"].split(" "):
+            self._event("token", {"text": word + " "})
+            time.sleep(self.server.options.token_delay_ms / 1000)
+        self._event("sources", {"sources": full["sources"]})
+        self._event("done", {})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _event(self, name, data):
+        chunk = f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+        self._record(len(chunk))
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.flush()
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, options):
+        super().__init__(address, StubHandler)
+        self.options = options
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def record(self, path, nbytes, request=False):
+        with self._stats_lock:
+            self.requests[path] += int(request)
+            self.bytes_sent[path] += nbytes
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.requests = Counter()
+            self.bytes_sent = Counter()
+
+    def stats(self):
+        """Requests served and body bytes sent per path since the last reset."""
+        with self._stats_lock:
+            return {"requests": dict(self.requests), "bytes": dict(self.bytes_sent)}
+
+
+def make_server(host="127.0.0.1", port=0, institutions=12, latency_ms=0.0, path_latency_ms=None,
+                stream=True, token_delay_ms=20.0, answer_words=120, catalog=True):
+    """Create a stub server; ``port=0`` picks a free port (see ``server.server_port``).
+
+    ``institutions`` sets the row count of tabular responses, ``latency_ms``
+    the delay before every response and ``path_latency_ms`` per-path overrides
+    such as ``{"/insights": 800}``.
+    """
+    options = argparse.Namespace(
+        institutions=institutions, latency_ms=latency_ms, path_latency_ms=dict(path_latency_ms or {}),
+        stream=stream, token_delay_ms=token_delay_ms, answer_words=answer_words, catalog=catalog,
+    )
+    return StubServer((host, port), options)
+
+
+def parse_path_latency(values):
+    """Turn ``["/insights=800", ...]`` into ``{"/insights": 800.0}``."""
+    latencies = {}
+    for value in values or []:
+        path, _, ms = value.partition("=")
+        latencies[path] = float(ms)
+    return latencies
+
+
+def start_in_thread(**kwargs):
+    """Start a stub server on a daemon thread and return it; stop it with ``server.shutdown()``."""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, name="stub-backend", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--institutions", type=int, default=12, help="rows in tabular responses")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every response")
+    parser.add_argument("--path-latency", action="append", metavar="PATH=MS",
+                        help="per-path delay override, e.g. /insights=800 (repeatable)")
+    parser.add_argument("--no-stream", dest="stream", action="store_false",
+                        help="answer /insights/stream with 404, like a non-streaming backend")
+    parser.add_argument("--no-catalog", dest="catalog", action="store_false",
+                        help="answer /catalog with 404, so the UI builds its index from /support-services")
+    parser.add_argument("--token-delay-ms", type=float, default=20.0)
+    parser.add_argument("--answer-words", type=int, default=120)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.institutions, args.latency_ms,
+                         parse_path_latency(args.path_latency), args.stream, args.token_delay_ms,
+                         args.answer_words, args.catalog)
+    print(f"Stub backend listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Support-services loading and table helpers.
+
+``ServicesFeed`` pages through ``/support-services`` with server-side
+cursor/limit/filter parameters and appends each page to one DataFrame kept in
+session state. A backend that ignores the filter is caught up client-side,
+the same way repeated full lists are de-duplicated. The per-institution services breakdown is built with
+vectorized string operations so rendering cost does not grow with a Python
+loop per row.
+"""
+import math
+
+import api_client
+from session_store import compact_frame, estimate_size
+
+# Rows fetched per /support-services request
+SUPPORT_PAGE_LIMIT = 100
+# Rows shown per page of the services breakdown table
+SERVICES_PAGE_SIZE = 50
+
+
+def first_page_payload(search=""):
+    payload = {"limit": SUPPORT_PAGE_LIMIT}
+    if search:
+        payload["q"] = search
+    return payload
+
+
+class ServicesFeed:
+    """Incrementally loaded support-services rows for one session."""
+
+    def __init__(self):
+        self.reset()
+        # ``nbytes`` as of the last time the feed was put in the session store
+        self.stored_nbytes = None
+
+    def reset(self, search=""):
+        self.search = search
+        self.frame = None
+        self.next_cursor = None
+        self.total = None
+        # Set once a page came back unfiltered, so its totals can't be trusted
+        self.search_ignored = False
+        self.snapshot_at = None
+        self.loaded = False
+        # Bytes held by ``frame``, measured once per page rather than on every rerun
+        self.nbytes = 0
+
+    @property
+    def has_more(self):
+        return self.next_cursor is not None
+
+    def load_more(self):
+        """Fetch the next page and append it; returns ``False`` if the request failed."""
+        payload = first_page_payload(self.search)
+        if self.next_cursor is not None:
+            payload["cursor"] = self.next_cursor
+        data = api_client.query("support-services", payload)
+        if data is None:
+            return False
+
+        page_df = api_client.as_frame(data.get("institutions"))
+        if self.search and "institution" in page_df.columns:
+            # Backends that ignore ``q`` return unfiltered rows; filter them here
+            matches = page_df["institution"].astype(str).str.contains(self.search, case=False, regex=False)
+            self.search_ignored = self.search_ignored or not matches.all()
+            page_df = page_df[matches].reset_index(drop=True)
+        if self.frame is None or self.frame.empty:
+            self.frame = compact_frame(page_df)
+        elif not page_df.empty:
+            import pandas as pd
+
+            # Backends without paging return the full list every time; de-duplicate
+            self.frame = compact_frame(pd.concat([self.frame, page_df], ignore_index=True).drop_duplicates(
+                "institution", ignore_index=True))
+        self.nbytes = estimate_size(self.frame)
+        self.next_cursor = data.get("next_cursor")
+        # An unfiltered total says nothing about how many rows match the search
+        self.total = None if self.search_ignored else data.get("total", self.total)
+        # Oldest snapshot any loaded page came from, for the freshness badge
+        if data.get("_snapshot_at"):
+            self.snapshot_at = min(self.snapshot_at or data["_snapshot_at"], data["_snapshot_at"])
+        self.loaded = True
+        return True
+
+
+def services_summary(df, preview=5):
+    """Return one row per institution with its services list and a short preview."""
+    import numpy as np
+    import pandas as pd
+
+    services = df["services"]
+    counts = services.str.len().fillna(0).astype(int)
+    extra = counts - preview
+    more = np.where(extra > 0, " ... and " + extra.astype(str) + " more", "")
+    return pd.DataFrame({
+        "institution": df["institution"],
+        "total_services": df["total_services"] if "total_services" in df else counts,
+        "preview": services.str[:preview].str.join(", ").fillna("") + more,
+        "services": services,
+    })
+
+
+def page_count(rows, page_size=SERVICES_PAGE_SIZE):
+    return max(1, math.ceil(rows / page_size))
+
+
+def page(df, number, page_size=SERVICES_PAGE_SIZE):
+    """Return the 1-based page ``number`` of ``df``."""
+    start = (number - 1) * page_size
+    return df.iloc[start:start + page_size]
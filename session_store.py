@@ -0,0 +1,244 @@
+"""Bounded per-session storage and memory accounting.
+
+``SessionStore`` is a size-aware LRU that lives in ``st.session_state``. Every
+value is measured when it is stored (``estimate_size``), DataFrames are
+compacted first (``compact_frame``), and the least recently used entries are
+evicted once the session goes over ``SESSION_STORE_BUDGET_MB``. All stores of
+the process are also registered in one weak registry, so the process as a
+whole stays under ``PROCESS_STORE_BUDGET_MB`` by evicting from the largest
+sessions first. A single busy session can therefore never hold more than its
+budget.
+
+Everything sizeable a session keeps between reruns goes through its store:
+the support-services feed, background request results, prefetched
+responses and the ROI inputs. ``session_report`` and ``process_report`` feed
+the sidebar "Memory" panel. Objects that hold data can expose an ``nbytes``
+attribute so the estimate counts what they retain rather than their shallow
+size; keep it cheap, since stores re-measure on every ``put``.
+"""
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict, deque
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+SESSION_STORE_BUDGET_MB = float(os.environ.get("SESSION_STORE_BUDGET_MB", "32"))
+PROCESS_STORE_BUDGET_MB = float(os.environ.get("PROCESS_STORE_BUDGET_MB", "512"))
+# Object columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_RATIO = 0.5
+MB = 2**20
+
+
+def compact_frame(df):
+    """Return ``df`` with downcast numerics and low-cardinality strings as categoricals."""
+    import pandas as pd
+
+    columns = {}
+    for name in df.columns:
+        col = df[name]
+        if pd.api.types.is_float_dtype(col):
+            columns[name] = pd.to_numeric(col, downcast="float")
+        elif pd.api.types.is_integer_dtype(col) and not pd.api.types.is_bool_dtype(col):
+            columns[name] = pd.to_numeric(col, downcast="integer")
+        elif (col.dtype == object and len(col)
+              and pd.api.types.infer_dtype(col, skipna=True) == "string"
+              and col.nunique() <= CATEGORY_MAX_RATIO * len(col)):
+            columns[name] = col.astype("category")
+    return df.assign(**columns) if columns else df
+
+
+def compact_value(value):
+    """``value`` with every DataFrame in it compacted, looking inside dicts, lists and tuples.
+
+    Containers are copied only when something inside them changed, so shared
+    objects (e.g. response-cache entries) are never mutated.
+    """
+    if type(value).__module__.startswith("pandas") and hasattr(value, "columns"):
+        return compact_frame(value)
+    if isinstance(value, dict):
+        items = {k: compact_value(v) for k, v in value.items()}
+        return items if any(items[k] is not value[k] for k in value) else value
+    if isinstance(value, (list, tuple)):
+        items = [compact_value(v) for v in value]
+        if all(new is old for new, old in zip(items, value)):
+            return value
+        return items if isinstance(value, list) else type(value)(items)
+    return value
+
+
+def estimate_size(value, _seen=None):
+    """Approximate bytes retained by ``value``, following containers and ``nbytes``."""
+    seen = _seen if _seen is not None else set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    module = type(value).__module__
+    if module.startswith("pandas") and hasattr(value, "memory_usage"):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(getattr(value, "nbytes", None), int):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k, seen) + estimate_size(v, seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset, deque)):
+        return sys.getsizeof(value) + sum(estimate_size(v, seen) for v in value)
+    return sys.getsizeof(value)
+
+
+class SessionStore:
+    def __init__(self, budget=SESSION_STORE_BUDGET_MB * MB):
+        self.budget = budget
+        self.nbytes = 0
+        self.evictions = 0
+        # Set on the script thread at registration, so background threads can store values too
+        self.registry = None
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # key -> (value, size)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        """Store ``value``, with any DataFrames in it compacted, and return it.
+
+        Storing the same key again re-measures it, so callers put mutable
+        objects back after growing them. Values larger than the whole budget
+        are returned but not kept.
+        """
+        value = compact_value(value)
+        size = estimate_size(value)
+        with self._lock:
+            self._discard(key)
+            if size <= self.budget:
+                self._entries[key] = (value, size)
+                self.nbytes += size
+                self._evict_to(self.budget)
+        if self.registry is not None:
+            self.registry.enforce_budget()
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            self._discard(key)
+            return entry[0] if entry else default
+
+    def evict_lru(self):
+        """Drop the least recently used entry; returns the bytes freed."""
+        with self._lock:
+            if not self._entries:
+                return 0
+            key, (_, size) = next(iter(self._entries.items()))
+            self._discard(key)
+            self.evictions += 1
+            return size
+
+    def items(self):
+        """``(key, bytes)`` for every entry, most recently used first."""
+        with self._lock:
+            return [(key, size) for key, (_, size) in reversed(self._entries.items())]
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[1]
+
+    def _evict_to(self, budget):
+        while self.nbytes > budget and self._entries:
+            self.evict_lru()
+
+
+class StoreRegistry:
+    """Weak registry of every session's store, for process-wide limits and reports."""
+
+    def __init__(self, budget=PROCESS_STORE_BUDGET_MB * MB):
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._stores = weakref.WeakValueDictionary()
+
+    def register(self, session_id, store):
+        with self._lock:
+            self._stores[session_id] = store
+        store.registry = self
+
+    def stores(self):
+        with self._lock:
+            return dict(self._stores)
+
+    def enforce_budget(self):
+        """Evict from the largest sessions until the process total fits the budget."""
+        stores = list(self.stores().values())
+        total = sum(s.nbytes for s in stores)
+        while total > self.budget:
+            largest = max(stores, key=lambda s: s.nbytes)
+            freed = largest.evict_lru()
+            if not freed:
+                break
+            total -= freed
+
+
+@st.cache_resource
+def get_store_registry():
+    return StoreRegistry()
+
+
+def get_session_store():
+    """This session's store, created and registered on first use."""
+    if "_store" not in st.session_state:
+        store = st.session_state["_store"] = SessionStore()
+        ctx = get_script_run_ctx(suppress_warning=True)
+        get_store_registry().register(ctx.session_id if ctx else id(store), store)
+    return st.session_state["_store"]
+
+
+def session_report():
+    """``(key, bytes)`` for everything this session keeps in session state, largest first."""
+    sizes = []
+    for key in st.session_state:
+        if key == "_store":
+            continue
+        sizes.append((key, estimate_size(st.session_state[key])))
+    sizes += [(f"store:{key}", size) for key, size in get_session_store().items()]
+    return sorted(sizes, key=lambda item: item[1], reverse=True)
+
+
+def process_report():
+    """RSS and per-session store totals for this server process."""
+    rss = None
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    stores = get_store_registry().stores()
+    return {
+        "rss": rss,
+        "sessions": len(stores),
+        "store_bytes": sum(s.nbytes for s in stores.values()),
+        "largest_store": max((s.nbytes for s in stores.values()), default=0),
+        "evictions": sum(s.evictions for s in stores.values()),
+    }
+
+
+def format_bytes(n):
+    if n is None:
+        return "–"
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
@@ -0,0 +1,133 @@
+"""Request coalescing across Streamlit sessions.
+
+When several sessions ask the same question at the same moment, only the
+first one (the leader) calls the backend; the others wait for its result
+instead of starting their own identical request. The group is created once
+per server process.
+
+A leader that ends without a result (the backend failed, a stream was cut
+short, or the user rerun mid-request) finishes with ``result=None``; its
+followers then fetch on their own rather than inherit a failure that was
+never theirs.
+"""
+import threading
+import time
+from collections import Counter
+
+import streamlit as st
+
+import perf
+
+# How long a follower waits for the leader before giving up and fetching itself
+WAIT_TIMEOUT = 120.0
+# How often a cancellable follower checks whether it was abandoned
+CANCEL_POLL_INTERVAL = 0.1
+
+
+class _Flight:
+    def __init__(self, label):
+        self.label = label
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.executed = Counter()
+        self.coalesced = Counter()
+
+    def lead(self, key, label):
+        """Claim ``key`` if nobody is fetching it yet.
+
+        Returns a flight handle for the new leader, who must call ``finish``,
+        or ``None`` if another caller is already in flight.
+        """
+        with self._lock:
+            if key in self._flights:
+                return None
+            flight = self._flights[key] = _Flight(label)
+            self.executed[label] += 1
+            return flight
+
+    def finish(self, key, flight, result=None, error=None):
+        """Publish the leader's outcome to every follower and release ``key``.
+
+        Leaving ``result`` as ``None`` tells followers to fetch it themselves.
+        """
+        flight.result, flight.error = result, error
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.done.set()
+
+    def abandon(self, key, flight):
+        """Release a flight that never reached the backend, without counting it as executed."""
+        with self._lock:
+            self.executed[flight.label] -= 1
+        self.finish(key, flight)
+
+    def do(self, key, fn, label, cancelled=None):
+        """Return ``fn()``, sharing one call among concurrent callers with the same ``key``.
+
+        A follower given a ``cancelled`` event stops waiting and returns
+        ``None`` as soon as it is set, so an abandoned background request
+        doesn't hold its worker thread for the leader's whole call.
+        """
+        flight = self.lead(key, label)
+        if flight is None:
+            with self._lock:
+                current = self._flights.get(key)
+                if current is not None:
+                    self.coalesced[label] += 1
+            if current is not None:
+                with perf.span("coalesced", label):
+                    finished = self._wait(current, cancelled)
+                if cancelled is not None and cancelled.is_set():
+                    return None
+                if finished:
+                    # Streamlit stops a rerun leader with a BaseException; that isn't ours to raise
+                    if isinstance(current.error, Exception):
+                        raise current.error
+                    if current.result is not None:
+                        return current.result
+            # The leader vanished, stalled or came back empty; fetch on our own
+            return fn()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            self.finish(key, flight, error=exc)
+            raise
+        self.finish(key, flight, result)
+        return result
+
+    @staticmethod
+    def _wait(flight, cancelled):
+        if cancelled is None:
+            return flight.done.wait(WAIT_TIMEOUT)
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while not flight.done.wait(CANCEL_POLL_INTERVAL):
+            if cancelled.is_set() or time.monotonic() >= deadline:
+                return False
+        return True
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._flights)
+
+    def stats(self):
+        """Per-label counts of backend calls made and calls saved by coalescing."""
+        with self._lock:
+            labels = sorted(set(self.executed) | set(self.coalesced))
+            return {
+                label: {"executed": self.executed[label], "coalesced": self.coalesced[label]}
+                for label in labels
+            }
+
+
+@st.cache_resource
+def get_single_flight():
+    return SingleFlight()
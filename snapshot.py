@@ -0,0 +1,192 @@
+"""Precomputed snapshot of slow-changing backend results.
+
+A snapshot is one Arrow IPC file holding the raw JSON responses for the
+common dashboard, support-services and comparison queries, one row per
+request with ``endpoint``, normalized ``key``, ``degree``, ``year``,
+``institution`` and ``body`` columns. The file is memory-mapped and indexed by
+``(endpoint, key)`` when loaded, so lookups cost a dict probe plus a JSON
+parse of one body.
+
+``api_client.query`` serves snapshot hits younger than ``SNAPSHOT_MAX_AGE``
+without touching the backend, and falls back to older snapshot rows when the
+backend is down. Free-text insights and ROI are never snapshotted.
+
+Build or refresh the file with ``python scripts/build_snapshot.py``, or set
+``SNAPSHOT_REFRESH_INTERVAL`` to rebuild it from a background thread. Set
+``SNAPSHOT_PATH`` to an empty string to turn the snapshot off entirely.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+import requests
+import streamlit as st
+
+from response_cache import normalize_payload
+
+# Empty disables the snapshot: no lookups, no reloads, no refresher
+SNAPSHOT_PATH = os.environ.get("SNAPSHOT_PATH", "career_snapshot.arrow")
+SNAPSHOT_MAX_AGE = float(os.environ.get("SNAPSHOT_MAX_AGE", str(24 * 3600)))
+SNAPSHOT_REFRESH_INTERVAL = float(os.environ.get("SNAPSHOT_REFRESH_INTERVAL", "0"))
+SNAPSHOT_ENDPOINTS = {"analyze", "support-services", "compare"}
+
+SNAPSHOT_DEGREES = [d.strip() for d in os.environ.get(
+    "SNAPSHOT_DEGREES", ",Computer Science,Engineering,Data Science,Information Technology").split(",")]
+SNAPSHOT_YEARS = range(2025, 2031)
+# "A|B;C|D" pairs of institutions to precompute comparisons for
+SNAPSHOT_COMPARISONS = [pair.split("|") for pair in os.environ.get(
+    "SNAPSHOT_COMPARISONS",
+    "IIT Delhi|IIT Bombay;VIT University|SRM University;BITS Pilani|IIT Delhi;Amrita University|KL University",
+).split(";") if "|" in pair]
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_plan():
+    """The ``(endpoint, payload)`` queries a snapshot materializes, besides support-services pages."""
+    plan = [("analyze", {"degree": degree, "year": year})
+            for degree in SNAPSHOT_DEGREES for year in SNAPSHOT_YEARS]
+    plan += [("compare", {"institution_a": a, "institution_b": b, "year": year})
+             for a, b in SNAPSHOT_COMPARISONS for year in SNAPSHOT_YEARS]
+    return plan
+
+
+def _fetch_raw(endpoint, payload, session=None):
+    """Return the raw JSON body for a query, or ``None`` on failure."""
+    import api_client  # api_client consults the snapshot, so import it lazily
+
+    method, path = api_client.ENDPOINTS[endpoint]
+    kwargs = {"params": payload} if method == "GET" else {"json": payload}
+    try:
+        resp = api_client.request(method, path, session=session, headers={"Accept": "application/json"}, **kwargs)
+    except requests.RequestException as exc:
+        logger.warning("Snapshot fetch %s failed: %s", path, exc)
+        return None
+    return resp.content if resp.ok else None
+
+
+def build_snapshot(path=SNAPSHOT_PATH, plan=None, workers=8, session=None):
+    """Fetch every planned query and atomically write a new snapshot file; returns the row count.
+
+    Pass ``session`` when calling from a background thread (see ``get_snapshot_store``).
+    """
+    import pyarrow as pa
+    from services import first_page_payload
+
+    plan = list(plan if plan is not None else snapshot_plan())
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        bodies = list(pool.map(lambda call: _fetch_raw(*call, session=session), plan))
+    rows = [(endpoint, payload, body) for (endpoint, payload), body in zip(plan, bodies) if body is not None]
+
+    # Walk the full support index page by page so "Load more" works offline too
+    payload = first_page_payload()
+    while payload is not None:
+        body = _fetch_raw("support-services", payload, session=session)
+        if body is None:
+            break
+        rows.append(("support-services", payload, body))
+        cursor = orjson.loads(body).get("next_cursor")
+        payload = {**first_page_payload(), "cursor": cursor} if cursor is not None else None
+
+    table = pa.table({
+        "endpoint": pa.array([r[0] for r in rows], pa.string()).dictionary_encode(),
+        "key": [normalize_payload(r[1]) for r in rows],
+        "degree": [r[1].get("degree") for r in rows],
+        "year": pa.array([r[1].get("year") for r in rows], pa.int16()),
+        "institution": [r[1].get("institution_a") for r in rows],
+        "body": pa.array([r[2] for r in rows], pa.binary()),
+    }).replace_schema_metadata({"created_at": str(time.time())})
+
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+class SnapshotStore:
+    """Memory-mapped view of the snapshot file, reloaded when the file changes."""
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        self.path = path
+        self.created_at = None
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._bodies = None
+        self._index = {}
+
+    @property
+    def age(self):
+        return time.time() - self.created_at if self.created_at else None
+
+    def __len__(self):
+        self._maybe_reload()
+        return len(self._index)
+
+    def lookup(self, endpoint, payload):
+        """Return the snapshotted response with a ``_snapshot_at`` timestamp, or ``None``."""
+        if endpoint not in SNAPSHOT_ENDPOINTS:
+            return None
+        self._maybe_reload()
+        with self._lock:
+            row = self._index.get((endpoint, normalize_payload(payload)))
+            if row is None:
+                return None
+            data = orjson.loads(memoryview(self._bodies[row].as_buffer()))
+            data["_snapshot_at"] = self.created_at
+        return data
+
+    def _maybe_reload(self):
+        if not self.path:
+            return
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        import pyarrow as pa
+
+        table = pa.ipc.open_file(pa.memory_map(self.path)).read_all()
+        index = {(e, k): i for i, (e, k) in enumerate(zip(table.column("endpoint").to_pylist(),
+                                                          table.column("key").to_pylist()))}
+        with self._lock:
+            self._bodies = table.column("body")
+            self._index = index
+            self.created_at = float(table.schema.metadata[b"created_at"])
+            self._mtime = mtime
+        logger.info("Loaded snapshot %s with %d rows", self.path, len(index))
+
+    def start_refresher(self, interval, session):
+        def run():
+            while True:
+                try:
+                    build_snapshot(self.path, session=session)
+                except Exception:
+                    logger.exception("Snapshot refresh failed")
+                time.sleep(interval)
+
+        threading.Thread(target=run, name="snapshot-refresh", daemon=True).start()
+
+
+@st.cache_resource
+def get_snapshot_store():
+    store = SnapshotStore()
+    if SNAPSHOT_REFRESH_INTERVAL > 0 and store.path:
+        import api_client
+
+        # Resolved on the script thread so the refresher never touches Streamlit's cache
+        store.start_refresher(SNAPSHOT_REFRESH_INTERVAL, api_client.get_session())
+    return store
+
+
+def freshness_badge(data):
+    """Show where the data came from when it was served from the snapshot."""
+    taken_at = data.get("_snapshot_at") if data else None
+    if taken_at:
+        age = time.time() - taken_at
+        label = f"{age / 3600:.0f} h" if age >= 3600 else f"{age / 60:.0f} min"
+        st.caption(f"📦 Offline snapshot · taken {label} ago")
@@ -0,0 +1,57 @@
+import socket
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import api_client  # noqa: E402
+from stub_backend import start_in_thread  # noqa: E402
+
+
+def _serve(monkeypatch, **kwargs):
+    server = start_in_thread(**kwargs)
+    monkeypatch.setattr(api_client, "API_BASE", f"http://127.0.0.1:{server.server_port}")
+    return server
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    server = _serve(monkeypatch)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def slow_backend(monkeypatch):
+    server = _serve(monkeypatch, latency_ms=1500)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_read_timeout_is_not_a_connection_failure(slow_backend, monkeypatch):
+    monkeypatch.setitem(api_client.TIMEOUTS, "/compare", (1.0, 0.5))
+    failures = []
+    assert api_client.post_json("/compare", {"institutions": ["IIT Delhi"], "year": 2025}, failures) is None
+    assert failures == ["timeout"]
+
+
+def test_refused_connection_is_a_connection_failure(monkeypatch):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    monkeypatch.setattr(api_client, "API_BASE", f"http://127.0.0.1:{port}")
+    monkeypatch.setattr(api_client, "BACKOFF_FACTOR", 0)
+    failures = []
+    assert api_client.post_json("/compare", {"institutions": ["IIT Delhi"], "year": 2025}, failures) is None
+    assert failures == ["connection"]
+
+
+def test_http_errors_record_the_status(backend):
+    failures = []
+    assert api_client.get_json("/no-such-path", failures=failures) is None
+    assert failures == [404]
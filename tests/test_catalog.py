@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from catalog import DEFAULT_DEGREES, NameIndex  # noqa: E402
+from stub_backend import KNOWN_INSTITUTIONS  # noqa: E402
+
+institutions = NameIndex(KNOWN_INSTITUTIONS)
+degrees = NameIndex(DEFAULT_DEGREES)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("IIT Delhi", "IIT Delhi"),
+    ("iit   delhi", "IIT Delhi"),
+    ("VIT Univ", "VIT University"),
+    ("vit uni.", "VIT University"),
+    ("BITS", "BITS Pilani"),
+    ("Manipal", "Manipal University"),
+])
+def test_institution_exact_abbreviation_and_unique_prefix(query, expected):
+    assert institutions.match(query) == (expected, 1.0)
+
+
+@pytest.mark.parametrize("query", [
+    "IIIT Delhi", "KIIT University", "Jain University", "Christ University",
+    "IIT",  # prefix of several institutions
+    "",
+])
+def test_institution_unknown_names_are_not_rewritten(query):
+    assert institutions.match(query) is None
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("CSE", "Computer Science"),
+    ("ece", "Electronics and Communication"),
+    ("Mech", "Mechanical Engineering"),
+    ("mathematics", "Mathematics"),
+])
+def test_degree_exact_abbreviation_and_unique_prefix(query, expected):
+    assert degrees.match(query) == (expected, 1.0)
+
+
+@pytest.mark.parametrize("query", [
+    "Biomedical Engineering", "Computer Engineering", "Software Engineering",
+    "Aerospace Engineering", "Mathematics and Computing",
+])
+def test_degree_unknown_names_are_not_rewritten(query):
+    assert degrees.match(query) is None
+
+
+def test_fuzzy_hits_are_still_suggested():
+    assert "IIT Delhi" in institutions.suggest("IIIT Delhi")
+    assert "Chemical Engineering" in degrees.suggest("Biomedical Engineering")
@@ -0,0 +1,56 @@
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from roi_engine import (  # noqa: E402
+    SALARY_SPREAD, RoiInputs, break_even_years, cumulative_earnings, roi_summary,
+)
+
+
+@pytest.mark.parametrize("growth", [0.0, 0.03, 0.1])
+@pytest.mark.parametrize("tuition", [200_000.0, 1_500_000.0, 6_000_000.0])
+def test_break_even_covers_tuition_exactly(tuition, growth):
+    years = break_even_years(tuition, 800_000, 85, growth)
+    assert cumulative_earnings(years, 800_000, 85, growth) == pytest.approx(tuition)
+
+
+def test_break_even_edge_cases():
+    assert break_even_years(0, 0, 0, 0.05) == 0
+    assert break_even_years(0, 800_000, 90, 0.0) == 0
+    assert break_even_years(500_000, 800_000, 0, 0.05) == math.inf
+    grid = break_even_years(np.array([0.0, 720_000.0]), 800_000, 90, 0.0)
+    assert grid.tolist() == [0.0, 1.0]
+
+
+@pytest.mark.parametrize("salary_range, expected", [
+    ("₹4,50,000 - ₹12,00,000", (450_000, 1_200_000)),
+    ("₹6,00,000 - ₹9,00,000", (600_000, 900_000)),
+    # Units the parser can't scale fall back to the spread around the median
+    ("5-12 LPA", None),
+    ("₹5.2L - ₹12L", None),
+    ("", None),
+])
+def test_from_response_salary_range(salary_range, expected):
+    inputs = RoiInputs.from_response({"median_salary": 800_000, "employment_rate": 90,
+                                      "salary_range": salary_range})
+    if expected is None:
+        expected = (800_000 * (1 - SALARY_SPREAD), 800_000 * (1 + SALARY_SPREAD))
+    assert (inputs.salary_low, inputs.salary_high) == pytest.approx(expected)
+
+
+def test_from_response_needs_a_salary():
+    assert RoiInputs.from_response({"employment_rate": 90}) is None
+
+
+def test_roi_summary_matches_flat_backend_model():
+    inputs = RoiInputs.from_response({"median_salary": 800_000, "employment_rate": 90})
+    summary = roi_summary(inputs, 1_000_000)
+    yearly = 800_000 * 0.9
+    assert summary["estimated_years_to_break_even"] == pytest.approx(1_000_000 / yearly)
+    assert summary["roi_5_year"] == pytest.approx((5 * yearly - 1_000_000) / 1_000_000 * 100)
+    assert summary["roi_10_year"] == pytest.approx((10 * yearly - 1_000_000) / 1_000_000 * 100)
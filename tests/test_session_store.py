@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from session_store import SessionStore, compact_value  # noqa: E402
+
+
+def _frame():
+    return pd.DataFrame({"institution": ["IIT Delhi", "IIT Bombay"] * 50,
+                         "avg_salary": np.arange(100, dtype="float64"), "rank": np.arange(100)})
+
+
+def test_put_compacts_frames_nested_in_results():
+    stored = SessionStore().put("result:compare", (7, {"summary": "s", "comparison": _frame()}))
+    frame = stored[1]["comparison"]
+    assert stored[0] == 7 and stored[1]["summary"] == "s"
+    assert frame["institution"].dtype == "category"
+    assert frame["avg_salary"].dtype == np.float32 and frame["rank"].dtype == np.int8
+
+
+def test_compact_value_leaves_shared_containers_alone():
+    response = {"comparison": _frame()}
+    compacted = compact_value(response)
+    assert compacted is not response and response["comparison"]["avg_salary"].dtype == np.float64
+    plain = {"summary": "s", "rows": [1, 2]}
+    assert compact_value(plain) is plain
+
+
+def test_lru_eviction_keeps_the_store_within_budget():
+    store = SessionStore(budget=3000)
+    for i in range(5):
+        store.put(f"k{i}", b"x" * 1000)
+    assert store.nbytes <= 3000 and store.evictions == 3
+    assert store.get("k0") is None and store.get("k4") is not None
@@ -0,0 +1,56 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from singleflight import SingleFlight  # noqa: E402
+
+
+def _follow(group, key, fn, **kwargs):
+    out = []
+    thread = threading.Thread(target=lambda: out.append(group.do(key, fn, "test", **kwargs)))
+    thread.start()
+    return thread, out
+
+
+def test_cancelled_follower_returns_promptly():
+    group = SingleFlight()
+    flight = group.lead("k", "test")
+    cancelled = threading.Event()
+    thread, out = _follow(group, "k", lambda: "own", cancelled=cancelled)
+    time.sleep(0.05)
+    started = time.perf_counter()
+    cancelled.set()
+    thread.join(2)
+    assert not thread.is_alive() and time.perf_counter() - started < 0.5
+    assert out == [None]
+    group.finish("k", flight, "leader")
+
+
+def test_follower_shares_the_leaders_result():
+    group = SingleFlight()
+    flight = group.lead("k", "test")
+    thread, out = _follow(group, "k", lambda: "own", cancelled=threading.Event())
+    time.sleep(0.05)
+    group.finish("k", flight, "leader")
+    thread.join(2)
+    assert out == ["leader"]
+
+
+def test_follower_fetches_itself_when_the_leader_ends_empty():
+    group = SingleFlight()
+    flight = group.lead("k", "test")
+    thread, out = _follow(group, "k", lambda: "own")
+    time.sleep(0.05)
+    group.finish("k", flight)
+    thread.join(2)
+    assert out == ["own"]
+
+
+def test_abandoned_flight_is_not_counted_as_executed():
+    group = SingleFlight()
+    group.abandon("k", group.lead("k", "insights"))
+    assert group.do("k", lambda: "answer", "insights") == "answer"
+    assert group.stats() == {"insights": {"executed": 1, "coalesced": 0}}